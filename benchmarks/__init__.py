@@ -0,0 +1,60 @@
+__doc__ = '''Benchmarks
+timeit based measurements of the simulator, run from the repository root:
+
+    python -m benchmarks -o results.json [-k image] [--repeat 5]
+
+results are written as JSON to the -o file, or to stdout without -o,
+while a table of them is printed to stderr
+
+every benchmark reports items (operations, frames, notes...) per second
+from the best of several repeats, together with the loop sizes used;
+the board runs headless on the virtual clock, so sleeps take no time
+
+Containment:
+- method
+-- measure
+- module
+-- bench_image
+-- bench_display
+-- bench_music
+-- bench_sensors
+-- bench_import
+'''
+__all__ = ['measure', 'results']
+
+from sys import stderr
+from os import environ
+from timeit import Timer
+from statistics import median
+
+# before microbit is imported
+environ['MICROBIT_BACKEND'] = 'headless'
+environ['MICROBIT_CLOCK'] = 'virtual'
+
+results = []
+options = {'repeat': 5, 'filter': ''}
+
+
+def measure(name, func, items=1, unit='op', number=None):
+    '''time func(), which handles items units per call,
+    number of calls per repeat picked by timeit when None'''
+    if options['filter'] not in name:
+        return
+    timer = Timer(func)
+    if number is None:
+        number = timer.autorange()[0]
+    times = [t / number / items for t in timer.repeat(options['repeat'], number)]
+    result = {
+        'name': name,
+        'unit': unit,
+        'per_second': 1 / min(times),
+        'best': min(times),
+        'median': median(times),
+        'items': items,
+        'number': number,
+        'repeat': options['repeat']
+    }
+    results.append(result)
+    print('%-40s %14.1f %s/s' % (name, result['per_second'], unit),
+          file=stderr)
+    return result
@@ -0,0 +1,40 @@
+from sys import version, platform, stdout
+from json import dump
+from argparse import ArgumentParser
+from . import results, options
+
+parser = ArgumentParser(
+    prog='python -m benchmarks', description='benchmark the simulator')
+parser.add_argument(
+    '-o', '--output', help='JSON file for results, stdout by default')
+parser.add_argument(
+    '-k', '--filter', default='', help='run benchmarks with names containing')
+parser.add_argument(
+    '--repeat', type=int, default=5, help='repeats of each timing (5)')
+args = parser.parse_args()
+options['repeat'] = args.repeat
+options['filter'] = args.filter
+
+from . import bench_image, bench_display, bench_music, bench_sensors, \
+    bench_import
+for suite in (bench_image, bench_display, bench_music, bench_sensors,
+              bench_import):
+    suite.run()
+
+try:
+    import numpy
+    numpy_version = numpy.__version__
+except ImportError:
+    numpy_version = None
+report = {
+    'python': version,
+    'platform': platform,
+    'numpy': numpy_version,
+    'benchmarks': results
+}
+if args.output:
+    with open(args.output, 'w') as f:
+        dump(report, f, indent=1, sort_keys=True)
+else:
+    dump(report, stdout, indent=1, sort_keys=True)
+    print()
@@ -0,0 +1,28 @@
+__doc__ = '''Display benchmarks
+frames committed per second of wall time by show & scroll,
+counted by a watcher of the LED screen'''
+
+from microbit import display, Image
+from microbit._hardware import LED
+from . import measure
+
+
+def _frames(func):
+    '''frames committed by one call of func'''
+    frames = []
+    LED.watchers.append(frames.append)
+    try:
+        func()
+    finally:
+        LED.watchers.remove(frames.append)
+    return len(frames)
+
+
+def run():
+    clocks = Image.ALL_CLOCKS
+    show = lambda: display.show(clocks, delay=1)
+    scroll = lambda: display.scroll('Hello, World!', delay=1)
+    text = lambda: display.show('0123456789', delay=1)
+    measure('display show images', show, _frames(show), 'frame')
+    measure('display show string', text, _frames(text), 'frame')
+    measure('display scroll', scroll, _frames(scroll), 'frame')
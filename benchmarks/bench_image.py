@@ -0,0 +1,33 @@
+__doc__ = '''Image benchmarks
+construction from strings & operations at several sizes,
+large images use the numpy engine when numpy is installed'''
+
+from microbit import Image
+from . import measure
+
+sizes = (5, 20, 100)
+
+
+def _text(size):
+    row = ('0123456789' * (size // 10 + 1))[:size]
+    return ':'.join(row[i:] + row[:i] for i in range(size))
+
+
+def run():
+    for size in sizes:
+        text = _text(size)
+        img = Image(text)
+        other = img.invert()
+        stamp = Image(_text(size // 2 or 1))
+        half = size // 2
+        name = 'image %dx%d ' % (size, size)
+        measure(name + 'from string', lambda: Image(text))
+        measure(name + 'copy', img.copy)
+        measure(name + 'invert', img.invert)
+        measure(name + 'add', lambda: img + other)
+        measure(name + 'multiply', lambda: img * 0.5)
+        measure(name + 'blit',
+                lambda: img.blit(stamp, 0, 0, half, half, half, half))
+        measure(name + 'shift_left', lambda: img.shift_left(1))
+        measure(name + 'shift_up', lambda: img.shift_up(1))
+        measure(name + 'crop', lambda: img.crop(1, 1, half, half))
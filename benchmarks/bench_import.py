@@ -0,0 +1,34 @@
+__doc__ = '''Import benchmark
+cold start of a new interpreter importing microbit,
+less the start of an interpreter alone'''
+
+from sys import executable, stderr
+from subprocess import run as _run
+from time import perf_counter
+from os import environ
+from . import options, results
+
+
+def _start(code):
+    t = perf_counter()
+    _run([executable, '-c', code], env=environ, check=True)
+    return perf_counter() - t
+
+
+def run():
+    if options['filter'] not in 'import microbit':
+        return
+    repeat = options['repeat']
+    bare = min(_start('pass') for i in range(repeat))
+    full = min(_start('import microbit') for i in range(repeat))
+    seconds = max(full - bare, 1e-9)
+    results.append({
+        'name': 'import microbit',
+        'unit': 'import',
+        'per_second': 1 / seconds,
+        'best': seconds,
+        'interpreter': bare,
+        'repeat': repeat
+    })
+    print('%-40s %14.1f ms' % ('import microbit', seconds * 1000),
+          file=stderr)
@@ -0,0 +1,28 @@
+__doc__ = '''Music benchmarks
+notes of all built-in tunes parsed per second,
+with an empty note cache and with every note cached'''
+
+import microbit  # puts music on the import path
+import music
+from . import measure
+
+tunes = [v for k, v in sorted(vars(music).items()) if k.isupper()]
+parse = music._parse_music_note
+
+
+def _parse_all():
+    for tune in tunes:
+        octave, duration = 4, 4
+        for note in tune:
+            freq, octave, duration = parse(note, octave, duration)
+
+
+def _parse_all_cold():
+    parse.cache_clear()
+    _parse_all()
+
+
+def run():
+    notes = sum(map(len, tunes))
+    measure('music parse notes', _parse_all_cold, notes, 'note')
+    measure('music parse notes cached', _parse_all, notes, 'note')
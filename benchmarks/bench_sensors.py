@@ -0,0 +1,11 @@
+__doc__ = '''Sensor benchmarks
+calls per second of accelerometer & compass readings'''
+
+from microbit import accelerometer, compass
+from . import measure
+
+
+def run():
+    compass.calibrate()
+    measure('accelerometer get_values', accelerometer.get_values)
+    measure('compass heading', compass.heading)
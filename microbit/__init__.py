@@ -6,6 +6,11 @@ Containment:
 -- microbit.running_time
 -- microbit.sleep
 -- microbit.temperature
+-- microbit.init (simulator backend, not in micro:bit)
+- class
+-- microbit.Board (simulator state, not in micro:bit)
+- tool
+-- python -m microbit.batch (runs many scripts headlessly)
 - module
 -- microbit.display
 -- microbit.accelerometer
@@ -19,6 +24,7 @@ Containment:
 from .display import Image, panic
 from ._timebase import *
 from ._hardware import *
+from ._board import Board
 
 # sub modules
 from . import display
@@ -26,11 +32,11 @@ from . import accelerometer
 from . import compass
 
 # add links
-from os.path import abspath, split
+from os.path import abspath, split, join
 from sys import path
 
 curr_path = split(__file__)[0]
-pkg_path = curr_path + '\\_external_modules'
+pkg_path = join(curr_path, '_external_modules')
 path.append(pkg_path)  # make 'music' an importable module
 path.append(split(curr_path)[0])  # make this an importable package
 
@@ -40,3 +46,12 @@ __all__ = [
     'pin9', 'pin10', 'pin11', 'pin12', 'pin13', 'pin14', 'pin15', 'pin16',
     'pin19', 'pin20', 'running_time', 'sleep', 'temperature'
 ]
+
+# start simulator, without window when a module of it is run by
+# python -m (like microbit.batch)
+from ._backend import init
+from os import environ
+from sys import argv
+if argv[:1] == ['-m']:
+    environ.setdefault('MICROBIT_BACKEND', 'headless')
+init()
@@ -0,0 +1,294 @@
+__doc__ = '''Audio engine
+renders tones played on pins into 16-bit mono PCM,
+square waves with the duty cycle of the pin's analog output
+
+tones are placed by their simulated start & end time,
+so timing is exact to the sample whatever the load is;
+a mixer thread takes them from a queue and writes blocks to a sink,
+mixed as whole arrays when numpy is installed
+- wav_sink: WAV file through the wave module
+- sounddevice_sink: sound card (ALSA, CoreAudio...), needs sounddevice
+
+WAV recording is read from environment variable MICROBIT_AUDIO on import,
+and may be started later with microbit.init(audio=...)
+
+Containment:
+- class
+-- mixer
+-- wav_sink
+-- sounddevice_sink
+- method
+-- render
+-- record
+-- stop_recording
+-- speaker
+'''
+__all__ = [
+    'mixer', 'wav_sink', 'sounddevice_sink', 'render', 'record',
+    'stop_recording', 'speaker'
+]
+
+from array import array
+from sys import byteorder
+from threading import Lock
+from queue import Queue, Empty
+from wave import open as _open_wave
+from ._hardware import _pins
+from ._timebase import _time
+from . import _board
+
+rate = 44100  # samples per second
+amplitude = 8000  # of each tone, mixed tones are clipped to 16 bits
+
+
+# ============ rendering ============
+np = None  # numpy, imported on first mix if installed
+_np_lock = Lock()
+_np_tried = False
+
+
+def _numpy():
+    global np, _np_tried
+    with _np_lock:
+        if not _np_tried:
+            try:
+                import numpy
+                np = numpy
+            except ImportError:
+                pass
+            _np_tried = True
+    return np
+
+
+# PCM bytes of samples [a, b) from tones [start, end, freq, duty, pin],
+# times in samples
+def _mix(tones, a, b, rate):
+    tones = [t for t in tones if t[0] < b and t[1] > a]
+    if not tones:
+        return bytes(2 * (b - a))  # silence
+    if _numpy():
+        return _mix_numpy(tones, a, b, rate)
+    buf = [0] * (b - a)
+    for start, end, freq, duty, pin in tones:
+        lo, hi = max(start, a), min(end, b)
+        high = duty * rate
+        for k in range(lo, hi):
+            # phase counted from tone start, in 1/rate of a period
+            buf[k - a] += amplitude if (k - start) * freq % rate < high \
+                else -amplitude
+    pcm = array('h', [min(32767, max(-32768, v)) for v in buf])
+    if byteorder == 'big':
+        pcm.byteswap()
+    return pcm.tobytes()
+
+
+# same samples as whole-array operations
+def _mix_numpy(tones, a, b, rate):
+    buf = np.zeros(b - a, np.int32)
+    for start, end, freq, duty, pin in tones:
+        lo, hi = max(start, a), min(end, b)
+        k = np.arange(lo - start, hi - start, dtype=np.int64)
+        buf[lo - a:hi - a] += np.where(k * freq % rate < duty * rate,
+                                       amplitude, -amplitude)
+    np.clip(buf, -32768, 32767, out=buf)
+    return buf.astype('<i2').tobytes()
+
+
+def render(tones, rate=rate, start=0, end=None):
+    '''PCM bytes of tones (freq, start, end[, duty]), times in seconds,
+    from start until end (defaults to end of last tone)'''
+    if end is None:
+        end = max([t[2] for t in tones] + [start])
+    tones = [(round(t[1] * rate), round(t[2] * rate), t[0],
+              t[3] if len(t) > 3 else 0.5, None) for t in tones]
+    return _mix(tones, round(start * rate), round(end * rate), rate)
+
+
+# ============ sinks ============
+class wav_sink:
+    '''write PCM into a WAV file'''
+
+    def __init__(self, path, rate=rate):
+        self.file = _open_wave(path, 'wb')
+        self.file.setnchannels(1)
+        self.file.setsampwidth(2)
+        self.file.setframerate(rate)
+
+    def write(self, data):
+        self.file.writeframes(data)
+
+    def close(self):
+        self.file.close()
+
+
+class sounddevice_sink:
+    '''play PCM on the default sound card, writes block while playing'''
+
+    def __init__(self, rate=rate):
+        import sounddevice
+        self.stream = sounddevice.RawOutputStream(
+            samplerate=rate, channels=1, dtype='int16')
+        self.stream.start()
+
+    def write(self, data):
+        self.stream.write(data)
+
+    def close(self):
+        self.stream.stop()
+        self.stream.close()
+
+
+# ============ mixer ============
+_stop = object()  # queued to end the mixer thread
+
+
+class mixer:
+    '''render tones of pins of current board into a sink
+    as simulated time goes on
+    heard(pin) picks the pins listened to, all by default
+    latency: seconds kept unrendered for tones announced late
+    size: tones queued for the mixer thread at most,
+    further tones are lost so that playing never waits for the mixer'''
+    block = 2048  # samples written at a time
+
+    def __init__(self, sink, rate=rate, heard=None, latency=0.1, size=1024):
+        self.sink = sink
+        self.rate = rate
+        self.heard = heard or (lambda pin: True)
+        self.latency = latency
+        self.events = Queue(size)  # tones waiting for the mixer thread
+        self._tones = []  # [start, end, freq, duty, pin], times in samples
+        self._pos = 0  # next sample to render
+        self._thread = None
+
+    def start(self):
+        self._pos = round(_time() * self.rate)
+        self.group = _board.current().pins
+        self.group.listeners.append(self.events)
+        self._thread = _board.spawn(self._run)
+        self._thread.start()
+        return self
+
+    def close(self):
+        '''render everything announced so far, then close the sink'''
+        self.group.listeners.remove(self.events)
+        self.events.put(_stop)
+        self._thread.join()
+
+    def _run(self):
+        while 1:
+            # tones are announced at their start, so after draining the queue
+            # every tone starting before t is known
+            t = _time()
+            ev = None
+            try:
+                ev = self.events.get(timeout=0.02)
+                while ev is not _stop:
+                    self._take(ev)
+                    ev = self.events.get_nowait()
+            except Empty:
+                pass
+            if ev is _stop:
+                break
+            self._render_until(t - self.latency)
+
+        # flush the rest
+        self._render_until(max([_time()] + [t[1] / self.rate
+                                            for t in self._tones]))
+        self.sink.close()
+
+    def _take(self, ev):
+        pin, freq, start, end, duty = ev
+        start, end = round(start * self.rate), round(end * self.rate)
+
+        # a pin plays one tone at a time, new one cuts the last
+        for tone in self._tones:
+            if tone[4] is pin and tone[1] > start:
+                tone[1] = max(start, tone[0])
+        if freq > 0 and self.heard(pin):
+            self._tones.append([start, end, freq, duty, pin])
+
+    def _render_until(self, t):
+        end = round(t * self.rate)
+        while self._pos < end:
+            a, b = self._pos, min(end, self._pos + self.block)
+            self.sink.write(_mix(self._tones, a, b, self.rate))
+            self._pos = b
+            self._tones = [tone for tone in self._tones if tone[1] > b]
+
+
+# ============ recording ============
+class _recorder:
+    recording = None  # mixer writing the WAV file
+
+    def close(self):
+        if self.recording:
+            self.recording.close()
+            self.recording = None
+
+
+_board.part('wav_recorder', _recorder)
+
+
+def record(path, rate=rate):
+    '''write tones of all pins of current board into a WAV file from now on,
+    closed by stop_recording (or on exit for the default board)'''
+    stop_recording()
+    recorder = _board.current().wav_recorder
+    recorder.recording = mixer(wav_sink(path, rate), rate).start()
+
+
+def stop_recording():
+    _board.current().wav_recorder.close()
+
+
+# ============ speaker ============
+class _beeper:
+    '''fallback speaker without sound card access:
+    Windows Beep, or printing the tones'''
+
+    def __init__(self, heard):
+        self.heard = heard
+        self.events = Queue(64)
+        try:
+            from ctypes import windll
+            self.beep = windll.LoadLibrary('kernel32.dll').Beep
+        except Exception:
+            print('loading sound output failed')
+            self.beep = lambda freq, dur: print(
+                'beep %.1fHz for %dms' % (freq, dur))
+
+    def start(self):
+        self.group = _board.current().pins
+        self.group.listeners.append(self.events)
+        _board.spawn(self._run).start()
+        return self
+
+    def close(self):
+        self.group.listeners.remove(self.events)
+        try:  # never wait behind a long Beep
+            while 1:
+                self.events.get_nowait()  # tones not beeped yet
+        except Empty:
+            self.events.put_nowait(_stop)
+
+    def _run(self):
+        while 1:
+            ev = self.events.get()
+            if ev is _stop:
+                return
+            pin, freq, start, end, duty = ev
+            scale = _board.current().clock.scale
+            dur = int((end - _time()) * 1000 / scale) - 30
+            if self.heard(pin) and dur > 0:
+                self.beep(int(freq), dur)
+
+
+def speaker():
+    '''start playing the music pin chosen in the beeper panel,
+    on the sound card if sounddevice works, else by beeps'''
+    heard = lambda pin: pin is _pins.music_pin
+    try:
+        return mixer(sounddevice_sink(), heard=heard, size=256).start()
+    except Exception:  # sounddevice or PortAudio missing
+        return _beeper(heard).start()
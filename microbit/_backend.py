@@ -0,0 +1,88 @@
+__doc__ = '''Backend selection
+decide how the simulated board is presented
+- 'tk': LED screen drawn on a tkinter canvas (default,
+    headless instead when no window can open)
+- 'headless': LEDs, buttons, pins & sensors kept in memory only,
+    tkinter never imported
+
+backend is read from environment variable MICROBIT_BACKEND on import,
+and may be switched later with microbit.init(backend=...)
+
+Extension of microbit:
+- method
+-- microbit.init
+'''
+__all__ = ['init']
+
+from os import environ
+from sys import stderr
+from atexit import register
+from ._timebase import set_clock
+from ._hardware import LED
+from . import _input_trace, _audio
+
+backends = ('tk', 'headless')
+current = None
+register(_audio.stop_recording)  # finish WAV file on exit
+
+
+def init(backend=None,
+         fps=None,
+         clock=None,
+         theme=None,
+         record=None,
+         replay=None,
+         audio=None):
+    '''Select simulator backend, 'tk' or 'headless'.
+    Defaults to environment variable MICROBIT_BACKEND, then 'tk'.
+    fps limits how often the tk screen redraws (60 by default).
+    clock switches timing to 'real', 'virtual' or a speed factor.
+    theme picks LED color of current board by name or colors,
+    see LED.set_theme.
+    record/replay give input trace files, see _input_trace;
+    MICROBIT_RECORD & MICROBIT_REPLAY are used on import.
+    audio gives a WAV file for tones of all pins, see _audio;
+    MICROBIT_AUDIO is used on import.'''
+    global current
+    if current is None:
+        record = record or environ.get('MICROBIT_RECORD')
+        replay = replay or environ.get('MICROBIT_REPLAY')
+        audio = audio or environ.get('MICROBIT_AUDIO')
+    if clock is not None:
+        set_clock(clock)
+    if theme is not None:
+        LED.set_theme(theme)
+    if record:
+        _input_trace.record(record)
+    if replay:
+        _input_trace.replay(replay)
+    if audio:
+        _audio.record(audio)
+    chosen = backend or environ.get('MICROBIT_BACKEND')  # not by default
+    if backend is None:
+        backend = current or chosen or 'tk'
+    if backend not in backends:
+        raise ValueError('unknown backend %r' % backend)
+    if fps and backend == 'tk':
+        from . import _screen
+        _screen.max_fps = fps
+    if backend == current:
+        return
+
+    # close old window
+    if current == 'tk':
+        from . import _screen
+        _screen.stop()
+
+    # open new window, without display (or tkinter) run headless
+    # unless tk was chosen
+    if backend == 'tk':
+        try:
+            from . import _screen
+            _screen.start()
+        except (ImportError, RuntimeError) as e:
+            if chosen:
+                raise
+            print('%s, running headless' % e, file=stderr)
+            backend = 'headless'
+    current = backend
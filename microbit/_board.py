@@ -0,0 +1,105 @@
+__doc__ = '''Simulated boards
+all state of a micro:bit (screen, pins, buttons, sensors, clock...)
+lives in a Board, so one process may run many boards at once
+
+module level objects (button_a, pin0, display...) act on the current board,
+kept in a context variable: the default board, unless inside board.run(...)
+or `with board:`; timed events & threads started by the simulator
+keep the board they were started from
+
+each module registers the state it keeps per board as a part,
+created the first time a board uses it
+
+Extension of microbit:
+- class
+-- microbit.Board
+'''
+__all__ = ['Board']
+
+from contextvars import ContextVar, copy_context
+from operator import attrgetter
+from threading import Thread, RLock
+
+_parts = {}  # part name -> factory
+_current = ContextVar('microbit_board', default=None)
+
+
+class Board:
+    '''one simulated micro:bit, parts are created on first access'''
+
+    def __init__(self, clock=None):
+        self._tokens = []
+        self._lock = RLock()  # parts are built once, may build others
+        if clock is not None:  # else read from MICROBIT_CLOCK
+            from ._timebase import _new_clock
+            self.clock = self.run(_new_clock, clock)
+
+    def __getattr__(self, name):
+        factory = _parts.get(name)
+        if factory is None:
+            raise AttributeError(name)
+        with self._lock:
+            if name not in self.__dict__:
+                self.__dict__[name] = self.run(factory)
+            return self.__dict__[name]
+
+    def run(self, func, *args, **kwargs):
+        '''call func with this board as current one'''
+        return copy_context().run(self._call, func, args, kwargs)
+
+    def _call(self, func, args, kwargs):
+        _current.set(self)
+        return func(*args, **kwargs)
+
+    def close(self):
+        '''stop timed events, threads & recordings of this board,
+        parts having a close method are closed'''
+        for part in list(self.__dict__.values()):
+            if hasattr(part, 'close'):
+                self.run(part.close)
+
+    # make current in the running thread until exit
+    def __enter__(self):
+        self._tokens.append(_current.set(self))
+        return self
+
+    def __exit__(self, *exc):
+        _current.reset(self._tokens.pop())
+
+
+default = Board()
+
+
+def current():
+    '''board the running code acts on'''
+    return _current.get() or default
+
+
+class proxy:
+    '''stands for an object of the current board, get(board) finds it'''
+    __slots__ = ('_get', )
+
+    def __init__(self, get):
+        object.__setattr__(self, '_get', get)
+
+    def __getattr__(self, name):
+        return getattr(self._get(current()), name)
+
+    def __setattr__(self, name, value):
+        setattr(self._get(current()), name, value)
+
+    def __repr__(self):
+        return repr(self._get(current()))
+
+
+def part(name, factory):
+    '''keep factory() as state of each board,
+    returns a proxy to the one of current board'''
+    _parts[name] = factory
+    return proxy(attrgetter(name))
+
+
+def spawn(target, *args):
+    '''thread running target under the current board'''
+    return Thread(
+        target=copy_context().run, args=(target, *args), daemon=True)
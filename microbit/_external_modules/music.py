@@ -2,26 +2,37 @@ __doc__ = '''micro:bit music module
 output analog to pins with different period for notes
 '''
 
-from threading import Thread as _Thread
-from time import sleep as _sleep, perf_counter as _perf
+from functools import lru_cache as _lru_cache
+from array import array as _array
+from threading import RLock as _RLock
 import microbit
-
-pin_class = microbit.pin0.__class__
+from microbit._timebase import _time, _sleep_until, call_at as _call_at, \
+    cancel as _cancel
+from microbit import _board
 
 if 'music':
-    _tick = 4
-    _bpm = 120
     _octave = 4
     _duration = 4
-    _tick_l = 125
 
-    # output frequency to pin
-    def _play_freq(pin, freq, duration):
-        pin.set_analog_period_microseconds(int(1000000 / freq))
-        pin.write_analog(511)
-        # with pin_class.tlock:
-        pin_class.tones.appendleft((pin, int(freq), _perf() + duration / 1000))
-        _sleep(duration / 1000)
+    # tempo & playing voices of each board
+    class _music_state:
+        def __init__(self):
+            self.tick = 4
+            self.bpm = 120
+            self.tick_l = 125
+            self.voices = {}  # pin id -> _voice
+            self.lock = _RLock()  # voices change on script & timer threads
+
+    _state = _board.part('music', _music_state)
+
+    # output frequency (0 for silence) to pin from start to end
+    def _sound(pin, freq, start, end):
+        if freq:
+            pin.set_analog_period_microseconds(int(1000000 / freq))
+            pin.write_analog(511)
+        else:
+            pin._set_volt(0)
+        pin._tone(int(freq), start, end)  # also cuts previous tone
 
     # read note
     _note_offset = {
@@ -33,11 +44,15 @@ if 'music':
         'A': 0,
         'B': 2
     }
+    _accidental = {'': 0, '#': 1, 'b': -1}
 
-    def _parse_music_note(note, pin, curr_octave, curr_duration):
+    # frequency (0 for rest) of a note, with octave & duration carried on
+    @_lru_cache(maxsize=1024)
+    def _parse_music_note(note, curr_octave, curr_duration):
+        tmp = note.split(':')
         try:
-            tmp = note.split(':')
-            assert len(tmp) in (1, 2)
+            if len(tmp) > 2:
+                raise ValueError
 
             # parse duration
             if len(tmp) == 2:
@@ -45,106 +60,77 @@ if 'music':
             tmp = tmp[0]
 
             # parse octave
-            if tmp[-1].isdigit():
+            if tmp[-1:].isdigit():
                 curr_octave = int(tmp[-1])
                 tmp = tmp[:-1]
 
             # parse frequency
-            assert len(tmp) <= 2
             tmp = tmp.capitalize()
             if tmp == 'R':  # rest
-                pin.volt = 0
-                _sleep(_tick_l * curr_duration * 0.001)
-                return curr_octave, curr_duration
-            elif 'A' <= tmp[0] <= 'G':  # note
-                offset = _note_offset[tmp[0]]
-                if len(tmp) == 2:
-                    if tmp[1] == '#':
-                        offset += 1
-                    elif tmp[1] == 'b':
-                        offset -= 1
-                    else:
-                        raise
-            else:  # illegal
-                raise
-
-        except:
-            raise ValueError('%r is not a valid note' % note)
+                return 0, curr_octave, curr_duration
+            offset = _note_offset[tmp[:1]] + _accidental[tmp[1:]]
+        except (ValueError, KeyError):
+            raise ValueError('%r is not a valid note' % note) from None
 
         freq = 2**(curr_octave - 4 + offset / 12) * 440
-        _play_freq(pin, freq, _tick_l * curr_duration)
-        return curr_octave, curr_duration
-
-    # read note sequence
-    def _parse_music_seq(music, pin, loop, in_thread=False):
-        if not music:
-            return
-
-        # enter loop once/forever
-        while 1:
-            # play
-            curr_octave, curr_duration = _octave, _duration
-            for i in music:
-                if in_thread and _thread_running[pin] != in_thread:
-                    return
-                curr_octave, curr_duration = _parse_music_note(
-                    i, pin, curr_octave, curr_duration)
-
-            # break if not loop
-            if not loop:
-                break
-
-        # clear afterwards
-        stop(pin)
+        return freq, curr_octave, curr_duration
+
+    # melody as flat array of frequency & duration in ms
+    @_lru_cache(maxsize=64)
+    def _compile(notes, tick_l):
+        res = _array('d')
+        curr_octave, curr_duration = _octave, _duration
+        for note in notes:
+            freq, curr_octave, curr_duration = _parse_music_note(
+                note, curr_octave, curr_duration)
+            res.extend((freq, tick_l * curr_duration))
+        return res
+
+    def compile(music):
+        '''precompute a melody for current tempo,
+        array of frequency (0 for rest) & duration in ms pairs'''
+        if isinstance(music, str):
+            music = [music]
+        return _compile(tuple(music), _state.tick_l)
 
     def set_tempo(ticks=4, bpm=120):
         assert isinstance(ticks, int) and isinstance(
             bpm, int) and ticks > 0 and bpm > 0
 
-        global _tick, _bpm, _tick_l
-        _tick = ticks
-        _bpm = bpm
-        _tick_l = 60000 / ticks / bpm
+        _state.tick = ticks
+        _state.bpm = bpm
+        _state.tick_l = 60000 / ticks / bpm
 
     def get_tempo():
-        return (_tick, _bpm)
+        return (_state.tick, _state.bpm)
 
     def play(music, pin=microbit.pin0, wait=True, loop=False):
-        if isinstance(music, str):
-            music = [music]
-
-        _thread_running[pin] = False
-        if wait:
-            _parse_music_seq(music, pin, loop)
-        else:
-            _play_bgm(_parse_music_seq, (music, pin, loop), pin)
-
-    def _pitch(freq, duration, pin, in_thread=False):
-        if duration < 0:
-            while 1:
-                if in_thread and _thread_running[pin] != in_thread:
-                    return
-                _play_freq(pin, freq, 100)
-        else:
-            _play_freq(pin, freq, duration)
-
-        # clear afterwards
-        stop(pin)
+        if not isinstance(music, _array):
+            music = compile(music)
+        _start(pin, music, loop, wait)
 
     def pitch(frequency, duration=-1, pin=microbit.pin0, wait=True):
         assert isinstance(duration, int) and duration >= -1
 
-        _thread_running[pin] = False
         if frequency <= 0:
-            return
-        if wait:
-            _pitch(frequency, duration, pin)
+            stop(pin)
+        elif duration < 0:  # until stopped, in 1s notes
+            _start(pin, _array('d', (frequency, 1000)), True, wait)
         else:
-            _play_bgm(_pitch, (frequency, duration, pin), pin)
+            _start(pin, _array('d', (frequency, duration)), False, wait)
 
     def stop(pin=microbit.pin0):
-        _thread_running[pin] = False
+        state = _board.current().music
+        with state.lock:
+            voice = state.voices.pop(pin.id, None)
+            if voice and voice.ev:
+                _cancel(voice.ev)
+            _silence(pin)
+
+    def _silence(pin):
         pin.write_digital(0)
+        now = _time()
+        pin._tone(0, now, now)
 
     def reset():
         set_tempo()
@@ -152,15 +138,64 @@ if 'music':
         _duration = 4
 
 
-if 'BGM':
-    _bgm_thread = _Thread()
-    _thread_running = dict((p, False) for p in pin_class.pins if p)
-
-    def _play_bgm(func, args, pin):
-        thr_id = _perf()
-        _thread_running[pin] = thr_id
-        _bgm_thread = _Thread(target=func, args=(*args, thr_id))
-        _bgm_thread.start()
+if 'voices':
+    # melody playing on each pin, notes started at absolute times so that
+    # late wakeups do not add up; background voices are stepped by the
+    # timed events of _timebase instead of a thread each
+
+    class _voice:
+        def __init__(self, pin, music, loop):
+            self.pin = pin
+            self.music = music
+            self.loop = loop
+            self.i = 0  # index of next note
+            self.t = _time()  # start of next note
+            self.ev = None  # pending timed event
+
+        # start next note, False when melody is over
+        def step(self):
+            if self.i >= len(self.music):
+                if not (self.loop and self.music):
+                    return False
+                self.i = 0
+            freq, duration = self.music[self.i], self.music[self.i + 1]
+            end = self.t + duration / 1000
+            _sound(self.pin, freq, self.t, end)
+            self.i += 2
+            self.t = end
+            return True
+
+    # replace voice of pin at once
+    def _start(pin, music, loop, wait):
+        state = _board.current().music
+        with state.lock:
+            old = state.voices.pop(pin.id, None)
+            if old and old.ev:
+                _cancel(old.ev)
+            voice = state.voices[pin.id] = _voice(pin, music, loop)
+        if wait:
+            while _next_note(state, voice):
+                _sleep_until(voice.t)
+        else:
+            _step_bgm(voice)
+
+    # play next note unless another voice took the pin (an event already
+    # taken by the timer thread cannot be cancelled), silence pin at end
+    def _next_note(state, voice):
+        with state.lock:
+            if state.voices.get(voice.pin.id) is not voice:
+                return False
+            if voice.step():
+                return True
+            del state.voices[voice.pin.id]
+            _silence(voice.pin)
+            return False
+
+    def _step_bgm(voice):
+        state = _board.current().music
+        with state.lock:
+            if _next_note(state, voice):
+                voice.ev = _call_at(voice.t, _step_bgm, voice)
 
 
 if 'builtin melody':
@@ -0,0 +1,87 @@
+__doc__ = '''micro:bit radio module
+packets broadcast between simulated boards, see microbit._radio
+'''
+
+from microbit import _board
+from microbit._radio import bus as _bus, defaults as _defaults, \
+    limits as _limits, RATE_250KBIT, RATE_1MBIT, RATE_2MBIT
+
+if 'radio':
+    _string_header = b'\x01\x00\x01'  # prepended to str messages
+
+    def _radio():
+        return _board.current().radio
+
+    def _enabled():
+        radio = _radio()
+        if not radio.on:
+            raise ValueError('radio is not enabled')
+        return radio
+
+    def on():
+        radio = _radio()
+        if not radio.on:
+            if _board.current().clock.scale == float('inf'):
+                raise ValueError('radio needs a real or scaled clock')
+            radio.on = True
+            _bus.join(radio)
+
+    def off():
+        radio = _radio()
+        if radio.on:
+            radio.on = False
+            _bus.leave(radio)
+            radio.queue.clear()
+            radio.incoming.clear()
+
+    def config(**kwargs):
+        for name, value in kwargs.items():
+            if name not in _limits:
+                raise TypeError('unexpected keyword argument %r' % name)
+            if value not in _limits[name]:
+                raise ValueError(
+                    'value out of range for argument %r' % name)
+        radio = _radio()
+        if radio.on:  # move to the new channel
+            _bus.leave(radio)
+            radio.config.update(kwargs)
+            _bus.join(radio)
+        else:
+            radio.config.update(kwargs)
+
+    def reset():
+        config(**_defaults)
+
+    def send_bytes(message):
+        radio = _enabled()
+        _bus.send(radio, bytes(message[:radio.config['length']]))
+
+    def receive_bytes():
+        packet = _bus.receive(_enabled())
+        if packet:
+            return packet[0]
+
+    def receive_bytes_into(buffer):
+        message = receive_bytes()
+        if message is not None:
+            n = min(len(buffer), len(message))
+            buffer[:n] = message[:n]
+            return n
+
+    def receive_full():
+        '''(message, rssi, timestamp in us) or None'''
+        packet = _bus.receive(_enabled())
+        if packet:
+            message, rssi, t = packet
+            return message, rssi, int(t * 1000000)
+
+    def send(message):
+        send_bytes(_string_header + str(message).encode())
+
+    def receive():
+        message = receive_bytes()
+        if message is None:
+            return None
+        if message[:3] != _string_header:
+            raise ValueError('received packet is not a string')
+        return message[3:].decode()
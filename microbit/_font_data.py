@@ -0,0 +1,110 @@
+__doc__ = '''Packed pixels of built-in images & font
+generated once from the image strings, 25 digits ('0'-'9') per 5x5 image,
+row by row; display.Image turns them into Image objects on first use
+
+Containment:
+- variable
+-- image_names
+-- images
+-- glyph_chars
+-- glyphs
+'''
+
+image_names = (
+    'HEART', 'HEART_SMALL', 'HAPPY', 'SMILE', 'SAD', 'CONFUSED', 'ANGRY',
+    'ASLEEP', 'SURPRISED', 'SILLY', 'FABULOUS', 'MEH', 'YES', 'NO', 'CLOCK12',
+    'CLOCK1', 'CLOCK2', 'CLOCK3', 'CLOCK4', 'CLOCK5', 'CLOCK6', 'CLOCK7',
+    'CLOCK8', 'CLOCK9', 'CLOCK10', 'CLOCK11', 'ARROW_N', 'ARROW_NE',
+    'ARROW_E', 'ARROW_SE', 'ARROW_S', 'ARROW_SW', 'ARROW_W', 'ARROW_NW',
+    'TRIANGLE', 'TRIANGLE_LEFT', 'CHESSBOARD', 'DIAMOND', 'DIAMOND_SMALL',
+    'SQUARE', 'SQUARE_SMALL', 'RABBIT', 'COW', 'MUSIC_CROTCHET',
+    'MUSIC_QUAVER', 'MUSIC_QUAVERS', 'PITCHFORK', 'XMAS', 'PACMAN', 'TARGET',
+    'TSHIRT', 'ROLLERSKATE', 'DUCK', 'HOUSE', 'TORTOISE', 'BUTTERFLY',
+    'STICKFIGURE', 'GHOST', 'SWORD', 'GIRAFFE', 'SKULL', 'UMBRELLA', 'SNAKE',
+)
+images = (
+    b'09090999999999909990009000000009090099900090000000'
+    b'00000090900000090009099900000000000000009000909990'
+    b'00000090900000009990900090000009090000000909090909'
+    b'90009090900000099999909090000099099000000999000000'
+    b'09090000000090009090009009000900000999990090900999'
+    b'99999990990000009090099900909000000000900090009000'
+    b'00000000090009090900090009000909090009000909090009'
+    b'00900009000090000000000000009000090009000000000000'
+    b'00000000990090000000000000000000000009990000000000'
+    b'00000000000090000099000000000000000009000009000090'
+    b'00000000000090000900009000000000000009000900009000'
+    b'00000000000090099000000000000000000999000000000000'
+    b'00000990000090000000000000900009000009000000000000'
+    b'00900099909090900900009000099900099009090900090000'
+    b'00900000909999900090009009000009000009090009900999'
+    b'00900009009090909990009000000900090909009900099900'
+    b'00900090009999909000009009990099000909000009000009'
+    b'00000009000909099999000009000099000909009009099999'
+    b'09090909090909090909090900090009090900090909000900'
+    b'00000009000909000900000009999990009900099000999999'
+    b'00000099900909009990000009090090900999909909099990'
+    b'90009900099999909990009000090000900009009990099900'
+    b'00900009900090999900999000999909009090099909999099'
+    b'90909909099999900900009000090009990009000999099999'
+    b'09999990909990099990099990090009990990990999000900'
+    b'99099999990999009990099900009900099999999999909090'
+    b'09900999000999909990000000090009990999990999009090'
+    b'00000099909999909090000009909999999009009999999099'
+    b'00900999990090009090900099999990909999999999990909'
+    b'00900009000090009990009009900009000090000999009090'
+    b'09990909099999909990099900999099999009009090009900'
+    b'9900099099090900999000000'
+)
+
+glyph_chars = ''.join(map(chr, range(32, 127)))  # printable ASCII
+glyphs = (
+    b'00000000000000000000000000900009000090000000009000'
+    b'09090090900000000000000000909099999090909999909090'
+    b'09990990090999090099099909900990090009000900990099'
+    b'09900900900990090090099090900009000000000000000000'
+    b'00900090000900009000009000900000900009000090009000'
+    b'00000090900090009090000000000000900099900090000000'
+    b'00000000000000000900090000000000000099900000000000'
+    b'00000000000000009000000000000900090009000900090000'
+    b'09900900909009090090099000090009900009000090009990'
+    b'99900000900990090000999909999000090009009009009900'
+    b'00990090909009099999000909999990000999900000999990'
+    b'00090009000999090009099909999900090009000900090000'
+    b'09990900090999090009099900999090009099900090009000'
+    b'00000090000000009000000000000000900000000090009000'
+    b'00090009000900000900000900000009990000000999000000'
+    b'09000009000009000900090000999090009009900000000900'
+    b'09990900099090990099099000990090090999909009090090'
+    b'99900900909990090090999000999090000900009000009990'
+    b'99900900909009090090999009999090000999009000099990'
+    b'99990900009990090000900000999090000900999000909990'
+    b'90090900909999090090900909990009000090000900099900'
+    b'99999000900009090090099009009090900990009090090090'
+    b'90000900009000090000999909000999099909099000990009'
+    b'90009990099090990099900090990090090900909009009900'
+    b'99900900909990090000900000990090090900900990000990'
+    b'99900900909990090090900090999090000099000009099900'
+    b'99999009000090000900009009009090090900909009009900'
+    b'90009900099000909090009009000990009909099909990009'
+    b'90090900900990090090900909000909090009000090000900'
+    b'99990009000900090000999900999009000090000900009990'
+    b'90000090000090000090000090999000090000900009009990'
+    b'00900090900000000000000000000000000000000000099999'
+    b'09000009000000000000000000000009990900909009009999'
+    b'90000900009990090090999000000009990900009000009990'
+    b'00090000900999090090099900990090090999009000009990'
+    b'00990090009990009000090000999090090099900009009900'
+    b'90000900009990090090900900900000000090000900009000'
+    b'00090000000009000090099009000090900990009090090090'
+    b'09000090000900009000009900000099099909099000990009'
+    b'00000999009009090090900900000009900900909009009900'
+    b'00000999009009099900900000000009990900900999000090'
+    b'00000099909000090000900000000000990090000090099000'
+    b'09000090000999009000009990000090090900909009009999'
+    b'00000900099000909090009000000090009900099090999099'
+    b'00000900900990009900900900000090009090900090099000'
+    b'00000999900090009000999900099000900099000090000990'
+    b'09000090000900009000090009900009000099000900099000'
+    b'0000000000099000009900000'
+)
@@ -0,0 +1,222 @@
+__doc__ = '''Frame trace
+log every frame committed to the LED screen with its running time,
+and compare traces of scripts against stored golden traces
+
+file format (binary):
+- header: b'MBFT' & version byte 1
+- each frame: time since last frame in us as a varint,
+    then 25 LEDs run-length coded, one byte per run: (length - 1) << 4 | level
+
+golden check, usable from pytest or by command line:
+
+    check('test_image.py', 'golden/test_image.mbft', sim_time=20)
+    python -m microbit._frame_trace test_image.py golden/test_image.mbft
+
+scripts run headlessly on a fresh board with the virtual clock
+(see batch.run_script), so a trace is the same on every run;
+--update (or update=True) writes the golden trace instead
+
+Containment:
+- method
+-- encode
+-- decode
+-- save
+-- load
+-- record
+-- stop_recording
+-- trace_script
+-- compare
+-- check
+'''
+__all__ = [
+    'encode', 'decode', 'save', 'load', 'record', 'stop_recording',
+    'trace_script', 'compare', 'check'
+]
+
+import sys
+from os.path import exists
+from argparse import ArgumentParser
+from ._timebase import _time
+from .batch import run_script
+from . import _board
+
+_header = b'MBFT\x01'
+
+
+# ============ coding ============
+# frames are (time_us, 25 bytes of lightness) pairs
+def _encode_frame(t, last, frame):
+    out = bytearray()
+    dt = t - last
+    while dt >= 0x80:  # varint, 7 bits a byte
+        out.append(dt & 0x7f | 0x80)
+        dt >>= 7
+    out.append(dt)
+    i = 0
+    while i < 25:
+        j = i + 1
+        while j < 25 and j - i < 16 and frame[j] == frame[i]:
+            j += 1
+        out.append((j - i - 1) << 4 | frame[i])
+        i = j
+    return out
+
+
+def encode(frames):
+    '''bytes of a trace'''
+    out = bytearray(_header)
+    last = 0
+    for t, frame in frames:
+        out += _encode_frame(t, last, frame)
+        last = t
+    return bytes(out)
+
+
+def decode(data):
+    '''trace from bytes'''
+    if data[:len(_header)] != _header:
+        raise ValueError('not a frame trace')
+    frames = []
+    t, i = 0, len(_header)
+    while i < len(data):
+        shift = 0
+        while 1:
+            byte = data[i]
+            i += 1
+            t += (byte & 0x7f) << shift
+            shift += 7
+            if byte < 0x80:
+                break
+        frame = bytearray()
+        while len(frame) < 25:
+            frame += bytes((data[i] & 15, )) * ((data[i] >> 4) + 1)
+            i += 1
+        frames.append((t, bytes(frame)))
+    return frames
+
+
+def save(path, frames):
+    with open(path, 'wb') as f:
+        f.write(encode(frames))
+
+
+def load(path):
+    with open(path, 'rb') as f:
+        return decode(f.read())
+
+
+# ============ recording ============
+class _recorder:
+    recording = None  # (file, watcher, screen)
+
+    def close(self):
+        if self.recording:
+            f, watcher, screen = self.recording
+            screen.watchers.remove(watcher)
+            f.close()
+            self.recording = None
+
+
+_board.part('frame_recorder', _recorder)
+
+
+def _watch(frames):
+    '''watcher appending (time_us, frame) of current board to frames'''
+    return lambda frame: frames.append((round(_time() * 1000000), frame))
+
+
+def record(path):
+    '''write every following frame of current board into a trace file'''
+    stop_recording()
+    board = _board.current()
+    f = open(path, 'wb')
+    f.write(_header)
+    last = [0]
+
+    def watcher(frame):
+        t = round(_time() * 1000000)
+        f.write(_encode_frame(t, last[0], frame))
+        last[0] = t
+
+    board.leds.watchers.append(watcher)
+    board.frame_recorder.recording = f, watcher, board.leds
+
+
+def stop_recording():
+    _board.current().frame_recorder.close()
+
+
+# ============ golden check ============
+def trace_script(path, sim_time=10, **kwargs):
+    '''run a script on a fresh board, returns (frames, result of run_script)
+    kwargs go to batch.run_script'''
+    board = _board.Board(clock='virtual')
+    frames = []
+    board.leds.watchers.append(board.run(_watch, frames))
+    try:
+        result = run_script(path, sim_time=sim_time, board=board, **kwargs)
+    finally:
+        board.close()
+    return frames, result
+
+
+def _show(frame):
+    return ':'.join(
+        ''.join(map(str, frame[y * 5:y * 5 + 5])) for y in range(5))
+
+
+def compare(frames, golden):
+    '''None if traces are the same, else where they first differ'''
+    for i, (got, want) in enumerate(zip(frames, golden)):
+        if got != want:
+            return 'frame %d: expected %s at %.3fms, got %s at %.3fms' % (
+                i, _show(want[1]), want[0] / 1000, _show(got[1]),
+                got[0] / 1000)
+    if len(frames) != len(golden):
+        return '%d frames, expected %d' % (len(frames), len(golden))
+
+
+def check(path, golden, update=False, sim_time=10, **kwargs):
+    '''assert frames of a script match the golden trace file,
+    update writes the golden trace instead'''
+    frames, result = trace_script(path, sim_time, **kwargs)
+    if result['status'] in ('error', 'wall_timeout', 'crashed'):
+        raise AssertionError('%s: %s\n%s' % (path, result['status'],
+                                             result.get('error', '')))
+    if update:
+        save(golden, frames)
+        return
+    if not exists(golden):
+        raise AssertionError('%s: no golden %s, run with --update' %
+                             (path, golden))
+    diff = compare(frames, load(golden))
+    if diff:
+        raise AssertionError('%s: %s' % (path, diff))
+
+
+def main(argv=None):
+    parser = ArgumentParser(
+        prog='python -m microbit._frame_trace',
+        description='compare display frames of a script with a golden trace')
+    parser.add_argument('script')
+    parser.add_argument('golden')
+    parser.add_argument(
+        '--update', action='store_true', help='write the golden trace')
+    parser.add_argument(
+        '--sim-time', type=float, default=10,
+        help='simulated seconds to run (10)')
+    parser.add_argument('-i', '--inputs', help='input trace to replay')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+    try:
+        check(args.script, args.golden, args.update, args.sim_time,
+              inputs=args.inputs, seed=args.seed)
+    except AssertionError as e:
+        print(e, file=sys.stderr)
+        return 1
+    print('updated' if args.update else 'ok', args.golden)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,158 @@
+__doc__ = '''Gesture recognizer
+derives gestures from accelerometer samples the way the micro:bit DAL does,
+constant-time work per sample so that 1 kHz sample streams keep up
+
+DAL counts samples taken every 20 ms, here windows are kept in ms
+so that streams of any sample rate behave the same
+
+Containment:
+- class
+-- recognizer
+- method
+-- track
+'''
+__all__ = ['recognizer', 'track']
+
+from threading import Lock
+from ._hardware import spatial, gesture, _add_gesture, input_hooks
+from ._timebase import _time
+from . import _board
+
+if 'thresholds':
+    tick = 20  # ms between samples of the DAL
+    tilt_tolerance = 200
+    freefall_tolerance = 400
+    shake_tolerance = 400
+    threshold_3g = 3072
+    threshold_6g = 6144
+    threshold_8g = 8192
+    gesture_damping = 5 * tick  # posture held before it becomes current
+    shake_damping = 10 * tick  # time for each counted shake to decay
+    shake_rtx = 30 * tick  # time "shake" lasts after detection
+    shake_count_threshold = 4  # direction changes counted as shake
+
+
+class recognizer:
+    '''turns (time_ms, x, y, z) samples into gestures,
+    confirmed gestures are passed to on_gesture(name), '' for none'''
+
+    def __init__(self, on_gesture, start='face up'):
+        self.on_gesture = on_gesture
+        self.t = None  # time of last sample
+        self.shake_sign = [False, False, False]
+        self.shake_count = 0
+        self.shake_timer = 0
+        self.shaken = False
+        self.curr = self.last = start  # candidate & confirmed gesture
+        self.sigma = gesture_damping  # time candidate has been held
+        self.lock = Lock()  # track() runs on the script & GUI threads
+
+    def posture(self, dt, x, y, z):
+        '''instantaneous gesture of a sample, None for no gesture'''
+        # direction changes on any axis
+        sign = self.shake_sign
+        detected = False
+        for i, v in enumerate((x, y, z)):
+            if (v < -shake_tolerance and sign[i]) or \
+               (v > shake_tolerance and not sign[i]):
+                detected = True
+                sign[i] = not sign[i]
+        if detected and self.shake_count < shake_count_threshold:
+            self.shake_count += 1
+            if self.shake_count == 1:
+                self.shake_timer = 0
+            if self.shake_count == shake_count_threshold:
+                self.shaken = True
+                self.shake_timer = 0
+                return 'shake'
+
+        # shake decays over time
+        if self.shake_count > 0:
+            self.shake_timer += dt
+            if self.shaken:
+                if self.shake_timer >= shake_rtx:
+                    self.shaken = False
+                    self.shake_timer = 0
+                    self.shake_count = 0
+            elif self.shake_timer >= shake_damping:
+                self.shake_timer = 0
+                self.shake_count -= 1
+        if self.shaken:
+            return 'shake'
+
+        # overall force, largest first
+        force = x * x + y * y + z * z
+        if force < freefall_tolerance * freefall_tolerance:
+            return 'freefall'
+        if force > threshold_8g * threshold_8g:
+            return '8g'
+        if force > threshold_6g * threshold_6g:
+            return '6g'
+        if force > threshold_3g * threshold_3g:
+            return '3g'
+
+        # tilt
+        edge = 1000 - tilt_tolerance
+        if x < -edge:
+            return 'left'
+        if x > edge:
+            return 'right'
+        if y < -edge:
+            return 'up'
+        if y > edge:
+            return 'down'
+        if z < -edge:
+            return 'face up'
+        if z > edge:
+            return 'face down'
+
+    def update(self, t, x, y, z):
+        '''take one sample at time t in ms'''
+        dt = 0 if self.t is None else max(t - self.t, 0)
+        self.t = t
+        g = self.posture(dt, x, y, z)
+
+        # low pass filter against jitter
+        if g == self.curr:
+            self.sigma = min(self.sigma + dt, gesture_damping)
+        else:
+            self.curr = g
+            self.sigma = 0
+        if self.curr != self.last and self.sigma >= gesture_damping:
+            self.last = self.curr
+            self.on_gesture(self.curr or '')
+
+
+def _confirm(g):
+    if g:
+        _add_gesture(g)
+    else:
+        gesture.curr = ''
+
+
+_board.part('recognizer', lambda: recognizer(_confirm))
+
+
+def track():
+    '''bring gestures of current board up to current time:
+    samples of an attached source, or held accelerometer values'''
+    board = _board.current()
+    rec = board.recognizer
+    with rec.lock:
+        now = _time() * 1000
+        source = board.spatial.source
+        if source:
+            t0 = -1 if rec.t is None else rec.t  # from time 0 on
+            for t, values in source.samples(t0, now):
+                rec.update(t, *values)
+        else:
+            rec.update(now, *board.spatial.accel)
+
+
+# new orientation starts counting at the time it is set
+def _on_input(kind, args):
+    if kind == 'rotation' and not spatial.source:
+        track()
+
+
+input_hooks.append(_on_input)
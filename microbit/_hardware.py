@@ -1,7 +1,8 @@
 __doc__ = '''Extend of microbit module
 simulation of buttons & temperature with mouse
-simulation of pins
+simulation of LEDs & pins
 control of spatial micro:bit position
+all state is kept per board, module objects act on the current board
 
 Extension of microbit:
 - method
@@ -14,17 +15,33 @@ Extension of microbit:
 __all__ = ['button_a', 'button_b', 'temperature']
 __all__ += ['pin%d' % i for i in range(21) if not i in (17, 18)]
 
-from time import perf_counter
+from ._timebase import _time
+from . import _board
 from collections import deque
-from math import sin, cos
+from threading import Lock
+from queue import Full
+from math import sin, cos, atan2, pi
 
 
 # temperature controlled by mouse wheel
+class _thermometer:
+    temp = 26
+    source = None  # sample stream replacing GUI, see _sensors
+
+
+thermometer = _board.part('thermometer', _thermometer)
+
+
 def temperature():
-    return temperature.temp
+    th = _board.current().thermometer
+    if th.source:
+        return _sample(th.source)[0]
+    return th.temp
 
 
-temperature.temp = 26
+# current values of a sample stream
+def _sample(source):
+    return tuple(map(int, source.at(_time() * 1000)))
 
 
 # ============ button class ============
@@ -34,6 +51,24 @@ class _button:
         self._button_down = False
         self._pressed = False
 
+        self._cv = None
+        self._uptodate = True
+
+    # update display color
+    def _update_color(self, cv):
+        self._uptodate = True
+        cv.itemconfig(
+            self._cv, fill='yellow' if self._button_down else 'black')
+
+    def _set_down(self, down):
+        self._button_down = down
+        if down:
+            self._pressed = True
+            self._count += 1
+        if self._uptodate:
+            self._uptodate = False
+            dirty.append(self._update_color)
+
     def is_pressed(self):
         return self._button_down
 
@@ -46,54 +81,222 @@ class _button:
         return res
 
 
-button_a = _button(1)  # left mouse button
-button_b = _button(3)  # right
+button_a = _board.part('button_a', lambda: _button(1))  # left mouse button
+button_b = _board.part('button_b', lambda: _button(3))  # right
+
+# canvas items waiting for redraw, as callables taking the canvas
+# each LED/pin is queued once until the screen thread redraws it
+dirty = _board.part('dirty', deque)
+
+
+# ============ LED class ============
+class _led_screen:
+    '''5x5 LEDs of a board'''
+
+    # LED skins as (inner off, inner on, outer off, outer on) colors
+    themes = {
+        'red': ((0, 0, 0), (750, 140, 120), (10, 15, 10), (255, 30, 30)),
+        'green': ((0, 0, 0), (140, 750, 120), (10, 15, 10), (30, 255, 30)),
+        'blue': ((0, 0, 0), (140, 200, 750), (10, 15, 10), (30, 60, 255)),
+        'yellow': ((0, 0, 0), (750, 600, 120), (10, 15, 10), (255, 200, 30)),
+    }
+    palette = ()  # default colors, see make_palette
+
+    @staticmethod
+    def colortext(fr, to, val):
+        return '#%02x%02x%02x' % tuple(
+            min(max(int(fr[i] + (to[i] - fr[i]) * val / 9), 0), 255)
+            for i in range(3))
+
+    @staticmethod
+    def make_palette(theme='red', gamma=1, brightness=1):
+        '''(inner, outer) color text of all 10 lightness levels
+        theme: name in LED.themes or a 4-color tuple like its values
+        gamma & brightness adjust the lightness curve'''
+        if isinstance(theme, str):
+            theme = _led_screen.themes[theme]
+        inner_fr, inner_to, outer_fr, outer_to = theme
+        palette = []
+        for level in range(10):
+            val = 9 * brightness * (level / 9)**gamma
+            palette.append((_led_screen.colortext(inner_fr, inner_to, val),
+                            _led_screen.colortext(outer_fr, outer_to, val)))
+        return tuple(palette)
+
+    def set_theme(self, theme='red', gamma=1, brightness=1):
+        '''LED colors of this screen, see make_palette'''
+        self.palette = self.make_palette(theme, gamma, brightness)
+
+        # repaint all with new colors
+        self.repaint()
+
+    def __init__(self):
+        self.pool = [[_led(self, x, y) for y in range(5)] for x in range(5)]
+        self.palette = _led_screen.palette  # own skin after set_theme
+
+        # whole screen as 25 lightness bytes, row-major
+        # replaced at once by commit, never modified in place
+        self.frame = bytes(25)
+        self._drawn = None  # frame currently on canvas
+        self._queued = False
+        self._lock = Lock()
+        self.watchers = []  # called with each new frame, see _frame_trace
+
+    # replace all 25 LEDs in one step
+    def commit(self, frame):
+        with self._lock:
+            self._swap(bytes(frame))
+
+    def _swap(self, frame):
+        if frame != self.frame:
+            self.frame = frame
+            self._mark_dirty()
+            for watcher in self.watchers:
+                watcher(frame)
+
+    def _mark_dirty(self):
+        if not self._queued:
+            self._queued = True
+            dirty.append(self.redraw)
+
+    # draw all LEDs again
+    def repaint(self):
+        self._drawn = None
+        self._mark_dirty()
+
+    # draw LEDs changed since last drawn frame
+    def redraw(self, cv):
+        self._queued = False
+        frame, drawn = self.frame, self._drawn
+        for i in range(25):
+            if drawn is None or frame[i] != drawn[i]:
+                self.pool[i % 5][i // 5].update_color(cv, frame[i])
+        self._drawn = frame
+
+
+class _led:
+    '''a single LED of a screen'''
+
+    def __init__(self, screen, x, y):
+        self.screen = screen
+        self.index = y * 5 + x
+
+    @property
+    def level(self):
+        return self.screen.frame[self.index]
+
+    def bind_to_cv(self, cv, x, y, outer_size, inner_size):
+        self.outer = cv.create_rectangle(
+            x - outer_size[0],
+            y - outer_size[1],
+            x + outer_size[0],
+            y + outer_size[1],
+            outline='')
+        self.inner = cv.create_rectangle(
+            x - inner_size[0],
+            y - inner_size[1],
+            x + inner_size[0],
+            y + inner_size[1],
+            outline='')
+        self.screen.repaint()
+
+    def set_lightness(self, level):
+        screen = self.screen
+        with screen._lock:
+            frame = bytearray(screen.frame)
+            frame[self.index] = max(0, (min(9, level)))
+            screen._swap(bytes(frame))
+
+    def update_color(self, cv, level):
+        inner, outer = self.screen.palette[level]
+        cv.itemconfig(self.inner, fill=inner)  # fake HDR
+        cv.itemconfig(self.outer, fill=outer)
+
+
+_led_screen.palette = _led_screen.make_palette()
+LED = _board.part('leds', _led_screen)
 
 
 # ============ pin class ============
-class _pin:
-    pins = [None] * 21  # all pins
-    screen_mode = True  # whether LED screen is on
+class _pin_group:
+    '''all pins of a board'''
+
+    # pin color of each voltage
+    colors = tuple(
+        '#FF%02x00' % int(169 * (1 - v / 1023)) for v in range(1024))
 
-    # music hook
-    tones = deque()  # format as (pin,freq,endperf_counter)
-    music_pin = None
+    def __init__(self):
+        self.pins = [None] * 21  # all pins
+        for i in range(21):
+            if not i in (17, 18):
+                self.pins[i] = _pin(self, i)
+        self.screen_mode = True  # whether LED screen is on
+
+        # music hook, queues taking (pin,freq,start,end,duty), see _audio
+        self.listeners = []
+        self.music_pin = self.pins[0]
+
+
+class _pin:
+    # announce a tone played with current analog output,
+    # replacing the last tone of this pin (freq 0 only silences it)
+    # a listener falling behind loses tones instead of stalling the script
+    def _tone(self, freq, start, end):
+        ev = (self, freq, start, end, self.volt / 1023)
+        for q in tuple(self.group.listeners):  # added & removed by threads
+            try:
+                q.put_nowait(ev)
+            except Full:
+                pass
+
+    # change output voltage, queue for redraw if changed
+    def _set_volt(self, volt):
+        if volt != self.volt:
+            self.volt = volt
+            if self._uptodate:
+                self._uptodate = False
+                dirty.append(self._update_color)
 
     # update display color
     def _update_color(self, cv):
         self._uptodate = True
-        new_color = '#FF%02x00' % int(169 * (1 - self.volt / 1023))
-        for i in self._cv_hook:
-            cv.itemconfig(i, fill=new_color)
-
-    def __init__(self, id):
-        _pin.pins[id] = self
+        new_color = _pin_group.colors[self.volt]
+        if new_color != self._drawn_color:
+            self._drawn_color = new_color
+            for i in self._cv_hook:
+                cv.itemconfig(i, fill=new_color)
+
+    def __init__(self, group, id):
+        self.group = group
         self.id = id
         self.volt, self.period = 0, 1000  # write output
         self.volt_r, self.period_r = 0, 1000  # read_input
+        self.touched = False
+        self._writes = 0  # count of write_* calls, shown in pin panel
 
         self._cv_hook = None
-        self._uptodate = False
+        self._uptodate = True
+        self._drawn_color = _pin_group.colors[0]
 
     def __check_occupied(self):
         if self.id in (5, 11):
             raise ValueError('pin in button mode')
-        elif self.id in (3, 4, 6, 7, 9, 10) and is_on():
+        elif self.id in (3, 4, 6, 7, 9, 10) and self.group.screen_mode:
             raise ValueError('pin in display mode')
         elif self.id == 12:
             raise ValueError('pin reserved')
 
     def read_digital(self):
         self.__check_occupied()
-        self.volt = 0
+        self._set_volt(0)
         return self.volt_r / 1023 * self.period_r >= (
-            perf_counter() * 1000000) % self.period_r
+            _time() * 1000000) % self.period_r
 
     def write_digital(self, value):
         self.__check_occupied()
         assert value in (0, 1)
-        self.volt = value and 1023
-        self._uptodate = False
+        self._writes += 1
+        self._set_volt(value and 1023)
 
     def set_pull(self, value):  # what's this?
         pass
@@ -102,14 +305,14 @@ class _pin:
         self.__check_occupied()
         if (self.id > 4 and self.id != 10):
             raise AttributeError("digital pins don't support analog input")
-        self.volt = 0
+        self._set_volt(0)
         return self.volt_r
 
     def write_analog(self, value):
         self.__check_occupied()
         assert isinstance(value, int) and 0 <= value < 1024
-        self.volt = value
-        self._uptodate = False
+        self._writes += 1
+        self._set_volt(value)
 
     def set_analog_period(self, period):
         self.__check_occupied()
@@ -127,50 +330,59 @@ class _pin:
         return self.touched
 
 
-# initialize pins
+_pins = _board.part('pins', _pin_group)
+
+
+# pins of current board
+def _pin_of(id):
+    return _board.proxy(lambda board: board.pins.pins[id])
+
+
 for i in range(21):
     if not i in (17, 18):
-        exec('pin%d = _pin(i)' % i)
-
-_pin.music_pin = pin0
+        exec('pin%d = _pin_of(i)' % i)
 
 
 # ============ accelerometer control ============
-class matrix3:
-    def __init__(self, *data):
+class matrix3(tuple):
+    '''immutable 3x3 matrix as a tuple of 3 row tuples'''
+
+    def __new__(cls, *data):
         '''data: matrix[row[num*3]*3]'''
-        self.data = data
+        return tuple.__new__(cls, (tuple(map(float, row)) for row in data))
 
     def __add__(self, other):
-        return matrix3(
-            [[a + b for a, b in zip(i, j)] for i, j in zip(self, other)])
+        return matrix3(*(tuple(a + b for a, b in zip(i, j))
+                         for i, j in zip(self, other)))
 
     def __mul__(self, other):
-        if isinstance(other, list):
-            return [
-                sum(i * j for i, j in zip(row, other)) for row in self.data
-            ]
+        (a, b, c), (d, e, f), (g, h, i) = self
         if isinstance(other, matrix3):
-            tmp = matrix3([0, 0, 0], [0, 0, 0], [0, 0, 0])
-            for row in range(3):
-                for col in range(3):
-                    tmp[row][col] = sum(
-                        float(self.data[row][i]) * float(other.data[i][col])
-                        for i in range(3))
-            return tmp
+            (j, k, l), (m, n, o), (p, q, r) = other
+            return tuple.__new__(matrix3, (
+                (a * j + b * m + c * p, a * k + b * n + c * q,
+                 a * l + b * o + c * r),
+                (d * j + e * m + f * p, d * k + e * n + f * q,
+                 d * l + e * o + f * r),
+                (g * j + h * m + i * p, g * k + h * n + i * q,
+                 g * l + h * o + i * r),
+            ))
+        x, y, z = other
+        return [a * x + b * y + c * z, d * x + e * y + f * z,
+                g * x + h * y + i * z]
 
     def __str__(self):
-        return '\n'.join(', '.join(map(str, row)) for row in self.data)
+        return '\n'.join(', '.join(map(str, row)) for row in self)
 
-    __repr__ = lambda self: 'matrix3(%s)' % self.data
+    __repr__ = lambda self: 'matrix3%s' % tuple.__repr__(self)
 
-    def __getitem__(self, arg):
-        return self.data.__getitem__(arg)
 
-
-class spatial:
+class _spatial:
+    g = 1024  # gravity in mg
     def_matrix = matrix3([1, 0, 0], [0, 1, 0], [0, 0, 1])
     r_matrix = def_matrix
+    accel = (0, 0, -g)  # accelerometer values of r_matrix
+    source = None  # sample stream replacing r_matrix, see _sensors
 
     @staticmethod
     def rotatex(r):
@@ -181,18 +393,117 @@ class spatial:
         return matrix3([cos(r), 0, -sin(r)], [0, 1, 0], [sin(r), 0, cos(r)])
 
 
-class gesture:
+class _gestures:
     all = ("up", "down", "left", "right", "face up", "face down", "freefall",
            "3g", "6g", "8g", "shake")
-    appeared = dict(zip(all, [False] * len(all)))
-    sequence = ["face up"]
-    curr = "face up"
-    appeared["face up"] = True
+
+    def __init__(self):
+        self.appeared = dict(zip(self.all, [False] * len(self.all)))
+        self.sequence = ["face up"]
+        self.curr = "face up"
+        self.appeared["face up"] = True
 
 
 # ============ compass control ============
-class magnetic:
+class _magnetic:
     strength = 25000
     direction = -1.5708
     str_x = strength * cos(direction)
-    str_y = strength * sin(direction)
\ No newline at end of file
+    str_y = strength * sin(direction)
+    field = (0, 0, 0)  # compass values under r_matrix
+    heading = 0
+    source = None  # sample stream replacing GUI, see _sensors
+    calibrated = False
+
+    @staticmethod
+    def heading_of(x, y):
+        return (int(-90 - atan2(y, x) * 180 / pi) + 360) % 360
+
+
+spatial = _board.part('spatial', _spatial)
+gesture = _board.part('gesture', _gestures)
+magnetic = _board.part('magnetic', _magnetic)
+
+
+# sensor values derived from orientation & field,
+# computed once per change so that reading them is O(1)
+def _update_sensors(spatial=spatial, magnetic=magnetic):
+    m = spatial.r_matrix
+    spatial.accel = tuple(-int(spatial.g * row[2]) for row in m)
+    sx, sy = magnetic.str_x, magnetic.str_y
+    x, y, z = (int(sx * row[0] + sy * row[1]) for row in m)
+    magnetic.field = x, y, z
+    magnetic.heading = magnetic.heading_of(x, y)
+
+
+_update_sensors(_spatial, _magnetic)  # defaults of new boards
+
+
+# ============ input events ============
+# every change from outside the board (GUI, replay) goes through feed
+# hooks are called with (kind, args) after each event, e.g. to record it
+input_hooks = []
+
+
+def _set_button(name, down):
+    (button_a if name == 'a' else button_b)._set_down(down)
+
+
+def _set_temperature(value):
+    thermometer.temp = min(100, max(0, value))
+
+
+def _add_gesture(g):
+    if gesture.curr != g:
+        gesture.sequence.append(g)
+    gesture.curr = g
+    gesture.appeared[g] = True
+
+
+def _clear_gestures():
+    gesture.sequence = []
+    for g in gesture.all:
+        gesture.appeared[g] = False
+
+
+def _set_rotation(rows):
+    spatial.r_matrix = matrix3(*rows)
+    _update_sensors()
+
+
+def _set_magnetic(direction):
+    magnetic.direction = direction
+    magnetic.str_x = magnetic.strength * cos(direction)
+    magnetic.str_y = magnetic.strength * sin(direction)
+    _update_sensors()
+
+
+def _set_pin_input(id, volt, period):
+    _pins.pins[id].volt_r, _pins.pins[id].period_r = volt, period
+
+
+def _set_touched(id, touched):
+    _pins.pins[id].touched = touched
+
+
+_input_handlers = {
+    'press': lambda name: _set_button(name, True),
+    'release': lambda name: _set_button(name, False),
+    'temperature': _set_temperature,
+    'gesture': _add_gesture,
+    'clear_gestures': _clear_gestures,
+    'rotation': _set_rotation,
+    'magnetic': _set_magnetic,
+    'pin': _set_pin_input,
+    'touch': _set_touched,
+}
+
+
+def feed(kind, *args):
+    '''apply an input event, args are plain JSON values:
+    press/release(name), temperature(value), gesture(name),
+    clear_gestures(), rotation(3x3 rows), magnetic(direction),
+    pin(id, volt, period), touch(id, touched)'''
+    _input_handlers[kind](*args)
+    for hook in input_hooks:
+        hook(kind, args)
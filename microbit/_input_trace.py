@@ -0,0 +1,83 @@
+__doc__ = '''Input trace
+record input events (buttons, temperature, gestures, rotation,
+magnetic field & pins) with their running time into a file,
+and replay them later against the current clock without any GUI
+
+file format: one JSON array per line
+- header: ["microbit-input", 1]
+- events: [time_ms, kind, *args], see _hardware.feed for kinds
+
+Containment:
+- method
+-- record
+-- stop_recording
+-- load
+-- replay
+'''
+__all__ = ['record', 'stop_recording', 'load', 'replay']
+
+from json import dumps, loads
+from ._hardware import feed, input_hooks
+from ._timebase import _time, call_at
+from . import _board
+
+_header = ['microbit-input', 1]
+
+
+class _recorder:
+    recording = None  # (file, hook)
+
+    def close(self):
+        if self.recording:
+            f, hook = self.recording
+            input_hooks.remove(hook)
+            f.close()
+            self.recording = None
+
+
+_board.part('input_recorder', _recorder)
+
+
+def record(path):
+    '''write every following input event of current board into a trace file'''
+    stop_recording()
+    board = _board.current()
+    f = open(path, 'w')
+    f.write(dumps(_header) + '\n')
+
+    def hook(kind, args):
+        if _board.current() is board:
+            f.write(dumps([round(_time() * 1000, 3), kind, *args]) + '\n')
+            f.flush()
+
+    input_hooks.append(hook)
+    board.input_recorder.recording = f, hook
+
+
+def stop_recording():
+    _board.current().input_recorder.close()
+
+
+def load(path):
+    '''read a trace file into a list of (time_ms, kind, args)'''
+    with open(path) as f:
+        lines = [loads(line) for line in f if line.strip()]
+    if not lines or lines[0] != _header:
+        raise ValueError('%r is not an input trace' % path)
+    return [(ev[0], ev[1], tuple(ev[2:])) for ev in lines[1:]]
+
+
+def replay(trace):
+    '''schedule events of a trace (path or loaded list) at their time,
+    events already due are applied at once
+    returns event handles for _timebase.cancel'''
+    if isinstance(trace, str):
+        trace = load(trace)
+    now = _time() * 1000
+    handles = []
+    for t, kind, args in trace:
+        if t <= now:
+            feed(kind, *args)
+        else:
+            handles.append(call_at(t / 1000, feed, kind, *args))
+    return handles
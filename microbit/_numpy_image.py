@@ -0,0 +1,73 @@
+__doc__ = '''NumPy engine for Image operations
+used by display.Image for large images when numpy is importable
+(imported only once such an image shows up),
+results are exactly the same as the pure-Python code
+
+invert & scale are already a single bytearray.translate,
+so only per-pixel arithmetic and blit are moved here
+
+Containment:
+- method
+-- usable
+-- combine
+-- blit
+'''
+
+np = None  # numpy, imported on first large image to keep import quick
+_tried = False
+
+# smaller images are faster without numpy call overhead
+# (blit is already row-sliced, so it pays off later)
+min_combine = 64
+min_blit = 256
+
+
+def usable(pixels, minimum):
+    global np, _tried
+    if pixels < minimum:
+        return False
+    if not _tried:
+        _tried = True
+        try:
+            import numpy
+            np = numpy
+        except ImportError:
+            pass
+    return np is not None
+
+
+# pixels of an Image as a writable 2D array sharing its buffer
+def _view(img):
+    return np.frombuffer(
+        img._data, dtype=np.uint8).reshape(img._height, img._width)
+
+
+# saturating add (sign=1) or subtract (sign=-1) other onto res
+def combine(res, other, sign):
+    h, w = other._height, other._width
+    area = _view(res)[:h, :w]
+    tmp = area.astype(np.int8)
+    if sign > 0:
+        tmp += _view(other).astype(np.int8)
+    else:
+        tmp -= _view(other).astype(np.int8)
+    np.clip(tmp, 0, 9, out=tmp)
+    area[...] = tmp
+    return res
+
+
+# copy an area of src onto dst, outside of src becomes 0
+# target area [cx0, cx1) x [cy0, cy1) is already clipped to dst
+def blit(dst, src, x, y, xdest, ydest, cx0, cx1, cy0, cy1):
+    s = _view(src)
+    if src is dst:
+        s = s.copy()
+    area = _view(dst)[ydest + cy0:ydest + cy1, xdest + cx0:xdest + cx1]
+    area[...] = 0
+
+    # part of the area covered by src
+    sx0, sx1 = max(x + cx0, 0), min(x + cx1, src._width)
+    sy0, sy1 = max(y + cy0, 0), min(y + cy1, src._height)
+    if sx0 < sx1 and sy0 < sy1:
+        area[sy0 - y - cy0:sy1 - y - cy0, sx0 - x - cx0:sx1 - x - cx0] = \
+            s[sy0:sy1, sx0:sx1]
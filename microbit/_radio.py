@@ -0,0 +1,226 @@
+__doc__ = '''Radio link
+broadcast bus carrying packets between boards of this process,
+backing the radio module
+
+a packet reaches every other board that is on with the same
+address, group, channel & data rate; it arrives after the link latency
+(in simulated time of the receiver), may be lost with the link loss rate,
+and is dropped when the receive queue of the board is full, counting
+packets still on the way
+
+boards on the bus need a real or scaled clock: virtual clocks of
+different boards are not kept in step, so radio.on() refuses them
+
+with the UDP transport, packets also travel between simulator processes
+on localhost: each process binds a port of a small range and sends
+every packet to the others; started by environment variable
+MICROBIT_RADIO=udp (or udp:first_port) on import, or later by udp()
+
+Containment:
+- class
+-- link
+- method
+-- set_link
+-- udp
+'''
+__all__ = ['link', 'set_link', 'udp']
+
+import socket
+from collections import deque
+from os import environ
+from random import Random
+from struct import Struct
+from threading import Lock, Thread
+from weakref import WeakSet, ref
+from . import _board
+
+if 'radio defaults':
+    RATE_250KBIT, RATE_1MBIT, RATE_2MBIT = 2, 0, 1
+    defaults = {
+        'length': 32,
+        'queue': 3,
+        'channel': 7,
+        'power': 6,
+        'address': 0x75626974,
+        'group': 0,
+        'data_rate': RATE_1MBIT
+    }
+    limits = {
+        'length': range(1, 252),
+        'queue': range(1, 256),
+        'channel': range(84),
+        'power': range(8),
+        'address': range(1 << 32),
+        'group': range(256),
+        'data_rate': (RATE_250KBIT, RATE_1MBIT, RATE_2MBIT)
+    }
+
+
+# ============ radio of a board ============
+class _radio:
+    '''radio state of a board'''
+
+    def __init__(self):
+        self.board = ref(_board.current())
+        self.on = False
+        self.config = dict(defaults)
+        self.queue = deque()  # (data, rssi, arrival time)
+        self.incoming = deque()  # same, still on the way
+
+    # address, group, channel & data rate must match to hear each other
+    @property
+    def key(self):
+        c = self.config
+        return c['address'], c['group'], c['channel'], c['data_rate']
+
+    def close(self):
+        if self.on:
+            self.on = False
+            bus.leave(self)
+
+    # move packets arrived until now into queue
+    def settle(self, now):
+        incoming, queue = self.incoming, self.queue
+        while incoming and incoming[0][2] <= now:
+            queue.append(incoming.popleft())
+
+    # packet on the way, dropped when queue & incoming are full
+    def push(self, packet):
+        if len(self.queue) + len(self.incoming) < self.config['queue']:
+            self.incoming.append(packet)
+
+
+_board.part('radio', _radio)
+
+
+# ============ bus ============
+class link:
+    '''boards of a process grouped by key, delivering packets
+    latency: seconds on the way, loss: chance of a packet being lost'''
+
+    def __init__(self, latency=0, loss=0, seed=None):
+        self.latency = latency
+        self.loss = loss
+        self.random = Random(seed)
+        self.groups = {}  # key -> radios that are on
+        self.lock = Lock()
+        self.transport = None
+
+    def join(self, radio):
+        with self.lock:
+            self.groups.setdefault(radio.key, WeakSet()).add(radio)
+
+    def leave(self, radio):
+        with self.lock:
+            group = self.groups.get(radio.key)
+            if group:
+                group.discard(radio)
+
+    def send(self, sender, data):
+        '''broadcast data from a radio to the others'''
+        key, power = sender.key, sender.config['power']
+        self.deliver(key, data, power, sender)
+        if self.transport:
+            self.transport.send(key, data, power)
+
+    def deliver(self, key, data, power, sender=None):
+        rssi = -90 + 6 * power  # rough, stronger with more power
+        with self.lock:
+            for radio in list(self.groups.get(key, ())):
+                if radio is sender or (self.loss and
+                                       self.random.random() < self.loss):
+                    continue
+                board = radio.board()
+                if board is None or board.clock.scale == float('inf'):
+                    continue
+                now = board.clock.time()
+                radio.settle(now)
+                radio.push((data, rssi, now + self.latency))
+
+    def receive(self, radio):
+        '''oldest packet arrived at radio, None if none'''
+        board = radio.board()
+        with self.lock:
+            radio.settle(board.clock.time())
+            if radio.queue:
+                return radio.queue.popleft()
+
+
+bus = link()
+
+
+def set_link(latency=0, loss=0, seed=None):
+    '''latency in seconds & loss rate of packets between boards,
+    seed makes losses reproducible'''
+    bus.latency = latency
+    bus.loss = loss
+    bus.random.seed(seed)
+
+
+# ============ UDP transport ============
+_header = Struct('<IBBBB')  # address, group, channel, data rate, power
+
+
+class _udp:
+    '''packets of this process to & from other processes on localhost'''
+
+    def __init__(self, link, port, ports, host):
+        self.link = link
+        self.host = host
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.settimeout(0.1)  # to notice close
+        self.closed = False
+        for p in range(port, port + ports):
+            try:
+                self.sock.bind((host, p))
+                break
+            except OSError:
+                pass
+        else:
+            raise OSError('no free port in %d-%d' % (port, port + ports - 1))
+        self.port = p
+        self.peers = [(host, q) for q in range(port, port + ports) if q != p]
+        self.thread = Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def send(self, key, data, power):
+        packet = _header.pack(*key, power) + data
+        for peer in self.peers:
+            try:
+                self.sock.sendto(packet, peer)
+            except OSError:  # peer not listening
+                pass
+
+    def _run(self):
+        size = _header.size
+        while not self.closed:
+            try:
+                packet = self.sock.recv(size + 256)
+            except OSError:  # timeout, or peer not listening (Windows)
+                continue
+            if len(packet) >= size:
+                *key, power = _header.unpack_from(packet)
+                self.link.deliver(tuple(key), packet[size:], power)
+
+    def close(self):
+        self.closed = True
+        self.thread.join()
+        self.sock.close()
+
+
+def udp(port=50500, ports=16, host='127.0.0.1'):
+    '''carry packets between processes too, through the first free UDP port
+    of port...port+ports-1; port None stops it'''
+    if bus.transport:
+        bus.transport.close()
+        bus.transport = None
+    if port is not None:
+        bus.transport = _udp(bus, port, ports, host)
+    return bus.transport
+
+
+if 'start from environment':
+    _mode = environ.get('MICROBIT_RADIO', '')
+    if _mode.startswith('udp'):
+        _port = _mode.partition(':')[2]
+        udp(int(_port) if _port else 50500)
@@ -1,62 +1,21 @@
 __doc__ = '''Tkinter layout module
-Initialize window with tkinter and a virtual LED class
+Initialize window with tkinter drawing the virtual LEDs
 also export mouse actions to buttons and temperature
+only imported by the 'tk' backend
 
 Containment:
-- class:
--- LED
+- method:
+-- start
+-- stop
 '''
 
 from tkinter import *
-from threading import Thread
+from threading import Thread, Event
+from traceback import print_exc
 from os import _exit
-from time import perf_counter, sleep
-from ._hardware import button_a, button_b, temperature, _pin
+from ._hardware import button_a, button_b, thermometer, _pins, LED, feed
 from ._sub_window import *
-
-
-# simulated LED class
-class LED:
-    pool = [[None] * 5 for i in range(5)]
-
-    @staticmethod
-    def colortext(fr, to, val):
-        return '#%02x%02x%02x' % tuple(
-            min(max(int(fr[i] + (to[i] - fr[i]) * val / 9), 0), 255)
-            for i in range(3))
-
-    def __init__(self):
-        self.level = 0
-        self.uptodate = True
-
-    def bind_to_cv(self, cv, x, y, outer_size, inner_size):
-        self.outer = cv.create_rectangle(
-            x - outer_size[0],
-            y - outer_size[1],
-            x + outer_size[0],
-            y + outer_size[1],
-            outline='')
-        self.inner = cv.create_rectangle(
-            x - inner_size[0],
-            y - inner_size[1],
-            x + inner_size[0],
-            y + inner_size[1],
-            outline='')
-        self.update_color(cv)
-
-    def set_lightness(self, level):
-        self.level = max(0, (min(9, level)))
-        self.uptodate = False
-
-    def update_color(self, cv):
-        self.uptodate = True
-        cv.itemconfig(
-            self.inner,
-            fill=LED.colortext((0, 0, 0), (750, 140, 120),
-                               self.level))  # fake HDR
-        cv.itemconfig(
-            self.outer,
-            fill=LED.colortext((10, 15, 10), (255, 30, 30), self.level))
+from . import _audio, _board
 
 
 # ============ functions in main thread ============
@@ -240,10 +199,10 @@ def init_interface(cv, width, height):
         if 'bind canvas to object':
             # large ones
             for i in range(3):
-                _pin.pins[i]._cv_hook = cv_large[i]
+                _pins.pins[i]._cv_hook = cv_large[i]
 
             # small ones
-            for pin, i in zip([p for p in _pin.pins[3:] if p],
+            for pin, i in zip([p for p in _pins.pins[3:] if p],
                               cv_small[:14] + cv_small[16:]):
                 pin._cv_hook = (i, )
 
@@ -252,61 +211,57 @@ def bind_input_callback(tk, cv):
     # buttons & temperature control
     if 'mouse':
         # control buttons
-        def bt_down(button):
-            button._button_down = True
-            button._pressed = True
-            button._count += 1
-            cv.itemconfig(button._cv, fill='yellow')
-
-        def bt_up(button):
-            button._button_down = False
-            cv.itemconfig(button._cv, fill='black')
-
         def modify_temp(dt):
-            temperature.temp = min(100, max(0, temperature.temp + dt))
+            feed('temperature', thermometer.temp + dt)
 
-        cv.bind('<Button-1>', lambda e: bt_down(button_a))
-        cv.bind('<ButtonRelease-1>', lambda e: bt_up(button_a))
-        cv.bind('<Button-3>', lambda e: bt_down(button_b))
-        cv.bind('<ButtonRelease-3>', lambda e: bt_up(button_b))
+        cv.bind('<Button-1>', lambda e: feed('press', 'a'))
+        cv.bind('<ButtonRelease-1>', lambda e: feed('release', 'a'))
+        cv.bind('<Button-3>', lambda e: feed('press', 'b'))
+        cv.bind('<ButtonRelease-3>', lambda e: feed('release', 'b'))
 
         # control temperature
-        cv.bind('<Button-2>', lambda e: temperature.__setattr__('temp', 26))
+        cv.bind('<Button-2>', lambda e: feed('temperature', 26))
         cv.bind('<MouseWheel>',
                 lambda e: modify_temp(1 if e.delta > 0 else -1))
 
     # pop information windows
     if 'keyboard':
 
+        panels = {}
+
         def key_down(event):
             event_pool = {
-                80: pin_info,  # P calls pin information window
-                66: beeper,  # B calls a beeper window playing sound
-                82: rotation,  # R calls spatial rotation window
-                71: gesture_info,  # G calls gesture window
-                67: compass_control  # C calls magnetic field direction window
+                'p': pin_info,  # P calls pin information window
+                'b': beeper,  # B calls a beeper window playing sound
+                'r': rotation,  # R calls spatial rotation window
+                'g': gesture_info,  # G calls gesture window
+                'c': compass_control  # C calls magnetic field direction window
             }
-            if event.keycode in event_pool:
-                sub = event_pool[event.keycode]
-                try:
-                    if sub.running and sub.window.is_alive():
-                        sub.running = False
-                    else:
-                        raise
-                except Exception as e:
-                    sub.window = Thread(target=sub)
-                    sub.running = True
-                    sub.window.start()
+            key = event.keysym.lower()
+            if key in event_pool:
+                sub = event_pool[key]
+                window = panels.get(sub)
+                if window and window.winfo_exists():
+                    window.destroy()
+                else:
+                    panels[sub] = sub(tk)
 
         tk.bind('<KeyPress>', key_down)
 
 
 # ============ main screen thread ============
-def run_screen():
+def run_screen(opened, failed):
+    # initialize tkinter window, start() waits for the result
     try:
-        # initialize tkinter window
-        width, height = 1000, 800
         tk = Tk(className='micro:bit Simulator')
+    except Exception as e:  # no display
+        failed.append(e)
+        opened.set()
+        return
+    opened.set()
+
+    try:
+        width, height = 1000, 800
         tk.geometry('+%d+%d' % (int(tk.winfo_screenwidth() - width) // 2, 10))
         tk.resizable(0, 0)
 
@@ -326,86 +281,93 @@ def run_screen():
         Label(tk, textvariable=info_left).pack(side=LEFT)
         Label(tk, textvariable=info_right, justify=RIGHT).pack(side=RIGHT)
 
-        # main loop
-        while 1:
-            if 'update LED color':
-                for x in range(5):
-                    for y in range(5):
-                        if not LED.pool[x][y].uptodate:
-                            LED.pool[x][y].update_color(cv)
-
-            if 'update pins':
-                for p in _pin.pins:
-                    if p:
-                        p._update_color(cv)
+        # track LED under mouse pointer
+        hover = [None]
+
+        def mouse_move(e):
+            screen_pos = (300, 200)
+            led_size = 80
+            led_x, led_y = (e.x - screen_pos[0]) // led_size, (
+                e.y - screen_pos[1]) // led_size
+            hover[0] = (led_x, led_y) if 0 <= led_x < 5 and 0 <= led_y < 5 \
+                else None
+
+        cv.bind('<Motion>', mouse_move, add='+')
+        cv.bind('<Leave>', lambda e: hover.__setitem__(0, None), add='+')
+
+        # draw pending changes, paced by max_fps
+        def refresh():
+            if not _running:
+                tk.destroy()
+                return
+
+            if 'redraw dirty items':
+                dirty = _board.default.dirty
+                for i in range(len(dirty)):
+                    dirty.popleft()(cv)
 
             if 'update information bar':
                 # left shows LED lightness
                 left_text = ''
-
-                mouse_x = tk.winfo_pointerx() - tk.winfo_rootx()
-                mouse_y = tk.winfo_pointery() - tk.winfo_rooty()
-
-                screen_pos = (300, 200)
-                led_size = 80
-                led_x, led_y = (mouse_x - screen_pos[0]) // led_size, (
-                    mouse_y - screen_pos[1]) // led_size
-                if 0 <= led_x < 5 and 0 <= led_y < 5:
+                if hover[0]:
+                    led_x, led_y = hover[0]
                     left_text = 'LED screen (%d, %d) at lightness %d.' % (
                         led_x, led_y, LED.pool[led_x][led_y].level)
-                info_left.set(left_text)
+                if info_left.get() != left_text:
+                    info_left.set(left_text)
 
                 # right shows temperature
-                info_right.set('Temperature: %d℃' % temperature.temp)
+                right_text = 'Temperature: %d℃' % thermometer.temp
+                if info_right.get() != right_text:
+                    info_right.set(right_text)
 
-            # update display
-            tk.update()
+            tk.after(int(1000 / max_fps), refresh)
 
-    # exit when main window terminated
-    except Exception as e:
-        print(e)
-        _exit(0)
-
-
-# initialize LED screen
-for x in range(5):
-    for y in range(5):
-        LED.pool[x][y] = LED()
+        # main loop
+        refresh()
+        tk.mainloop()
 
-# run screen
-_screen_thread = Thread(target=run_screen)
-_screen_thread.start()
+    # window crashed, the program cannot go on
+    except Exception:
+        print_exc()
+        _exit(1)
 
-# ============ beeper thread ============
+    # window closed by user
+    if _running:
+        _exit(0)
 
 
-def run_beeper():
-    # load beeper
-    try:
-        from ctypes import windll
-        bp = windll.LoadLibrary('kernel32.dll')
-        beep = bp.Beep  # frequency, duration
-        # raise
-    except:
-        print('loading Windows beeper failed')
-
-        def beep(freq, dur):
-            print('beep %.1fHz for %dms' % (freq, dur))
-
-    while 1:
-        if _pin.tones:
-            tone = _pin.tones.pop()
-        else:
-            sleep(0.005)
-            continue
-        if tone[0] != _pin.music_pin:
-            continue
-
-        dur = int((tone[2] - perf_counter()) * 1000) - 30
-        if dur > 0:
-            beep(tone[1], dur)
-
-
-# run beeper
-_beeper_thread = Thread(target=run_beeper)
-_beeper_thread.start()
+# ============ backend control ============
+_running = False
+_screen_thread = _speaker = None
+max_fps = 60  # upper limit of screen redraws per second
+
+
+def start():
+    '''open the simulator window and start the beeper,
+    RuntimeError if the window cannot open'''
+    global _running, _screen_thread, _speaker
+    if _running:
+        return
+    _running = True
+    opened, failed = Event(), []
+    _screen_thread = Thread(target=run_screen, args=(opened, failed))
+    _screen_thread.start()
+    opened.wait()
+    if failed:
+        _running = False
+        _screen_thread.join()
+        _screen_thread = None
+        raise RuntimeError('cannot open simulator window: %s' % failed[0])
+    _speaker = _audio.speaker()
+
+
+def stop():
+    '''close the simulator window, board state is kept'''
+    global _running, _speaker
+    _running = False
+    if _speaker:
+        _speaker.close()
+        _speaker = None
+    if _screen_thread:
+        _screen_thread.join()
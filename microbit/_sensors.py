@@ -0,0 +1,172 @@
+__doc__ = '''Sensor sample streams
+feed accelerometer, compass & temperature from data instead of GUI controls,
+values are interpolated at running_time()
+
+a source gives tuples of values at a time in ms:
+- stream: samples (time_ms, v1, v2...) from any iterable, read lazily
+- function: values computed from time, functions can be added up
+
+Containment:
+- class
+-- stream
+-- function
+- method
+-- from_csv
+-- from_npy
+-- constant
+-- noise
+-- drift
+-- shake
+-- attach
+-- detach
+'''
+__all__ = [
+    'stream', 'function', 'from_csv', 'from_npy', 'constant', 'noise', 'drift',
+    'shake', 'attach', 'detach'
+]
+
+from csv import reader
+from math import sin, pi
+from random import Random
+from ._hardware import spatial, magnetic, thermometer
+
+
+# ============ sources ============
+class stream:
+    '''samples in increasing time, linear interpolation between them
+    only the 2 samples around current time are kept in memory'''
+
+    def __init__(self, samples):
+        self._it = iter(samples)
+        self._prev = self._next = self._read()
+        if self._next is None:
+            raise ValueError('no samples')
+
+    def _read(self):
+        for sample in self._it:
+            return sample[0], tuple(sample[1:])
+
+    def samples(self, t0, t1):
+        '''raw samples in (t0, t1], consumed in order'''
+        while self._next[0] <= t1:
+            if self._next[0] > t0:
+                yield self._next
+            if not self._step():
+                return
+
+    def _step(self):
+        sample = self._read()
+        if sample is None:
+            return False
+        self._prev, self._next = self._next, sample
+        return True
+
+    def at(self, t):
+        while self._next[0] < t and self._step():
+            pass
+        (t0, v0), (t1, v1) = self._prev, self._next
+        if t >= t1 or t1 == t0:
+            return v1
+        if t <= t0:
+            return v0
+        k = (t - t0) / (t1 - t0)
+        return tuple(a + (b - a) * k for a, b in zip(v0, v1))
+
+
+class function:
+    '''values computed from time in ms'''
+    period = 20  # ms between samples handed out by samples()
+
+    def __init__(self, func):
+        self.func = func
+
+    def at(self, t):
+        return self.func(t)
+
+    def samples(self, t0, t1):
+        '''values sampled every period ms in (t0, t1]'''
+        t = (t0 // self.period + 1) * self.period
+        while t <= t1:
+            yield t, self.func(t)
+            t += self.period
+
+    def __add__(self, other):
+        return function(lambda t: tuple(
+            a + b for a, b in zip(self.func(t), other.func(t))))
+
+
+# ============ readers ============
+def from_csv(path):
+    '''stream from a CSV file of time_ms, v1, v2... rows,
+    blank lines are skipped, so is a non-numeric first row as header'''
+
+    def rows():
+        with open(path, newline='') as f:
+            first = True
+            for row in reader(f):
+                if not ''.join(row).strip():
+                    continue
+                try:
+                    yield tuple(map(float, row))
+                except ValueError:
+                    if not first:
+                        raise
+                first = False
+
+    return stream(rows())
+
+
+def from_npy(path, chunk=4096):
+    '''stream from a 2D .npy array, first column time in ms
+    needs numpy, the file is memory-mapped and read chunk rows at a time'''
+    import numpy
+    data = numpy.load(path, mmap_mode='r')
+
+    def rows():
+        for i in range(0, len(data), chunk):
+            yield from map(tuple, data[i:i + chunk].tolist())
+
+    return stream(rows())
+
+
+# ============ synthetic sources ============
+def constant(*values):
+    return function(lambda t: values)
+
+
+def noise(amplitude, axes=3, seed=None):
+    '''gaussian noise on each axis'''
+    gauss = Random(seed).gauss
+    return function(lambda t: tuple(gauss(0, amplitude) for i in range(axes)))
+
+
+def drift(*rates):
+    '''values growing by rates per second'''
+    return function(lambda t: tuple(r * t / 1000 for r in rates))
+
+
+def shake(amplitude, hz=5, axes=(1, 1, 0)):
+    '''sine wave on chosen axes'''
+    w = 2 * pi * hz / 1000
+    return function(lambda t: tuple(
+        a * amplitude * sin(w * t) for a in axes))
+
+
+# ============ attach to sensors ============
+_targets = {
+    'accelerometer': spatial,
+    'compass': magnetic,
+    'temperature': thermometer
+}
+
+
+def attach(sensor, source):
+    '''read sensor ('accelerometer', 'compass' or 'temperature') of current
+    board from source,
+    values are (x, y, z) in mg, (x, y, z) in nT and (degrees, )'''
+    _targets[sensor].source = source
+
+
+def detach(sensor):
+    '''go back to GUI controlled values'''
+    _targets[sensor].source = None
@@ -1,114 +1,164 @@
 __doc__ = '''sub-windows called by main screen thread
 all functions act like below:
-def func():
+def func(master):
+    sub = Toplevel(master)
     initialize()
-    while 1:
-        assert func.running
+    def update():
         update_once()
-where func.running is controlled outside
+        sub.after(refresh_ms, update)
+    update()
+    return sub
+where the screen thread destroys sub to close it
+so every panel lives on the single main Tk loop
 
 contains nothing accessible
 '''
 
 __all__ = ['pin_info', 'beeper', 'rotation', 'gesture_info', 'compass_control']
 from tkinter import *
-from ._hardware import _pin, spatial, gesture, magnetic
+from ._hardware import _pins, spatial, gesture, magnetic, feed
 from math import cos, sin, atan2
+from time import perf_counter
 
+refresh_ms = 100  # panel update interval
+pin_refresh_ms = 250  # pin table is larger, update less often
 
-# a 2-column table showing all accessible pins' status
-def pin_info():
+
+# schedule update of a panel until it is closed
+def _repeat(sub, update, interval=None):
+    def loop():
+        if sub.winfo_exists():
+            update()
+            sub.after(interval or refresh_ms, loop)
+
+    loop()
+
+
+# a 3-column table showing all accessible pins' status & write rate
+def pin_info(master):
     info_width = 45
 
     # init
-    sub = Tk()
+    sub = Toplevel(master)
     sub.title('Pin Status')
     sub.resizable(0, 0)
     Label(sub, text='Name').grid(row=0, column=0)
     Label(sub, text='-- Status --', width=info_width).grid(row=0, column=2)
+    Label(sub, text='Writes/s').grid(row=0, column=3)
 
     # layout
     curr_row = 1
     rows = []
-    for i in range(len(_pin.pins)):
-        pin = _pin.pins[i]
+    for i in range(len(_pins.pins)):
+        pin = _pins.pins[i]
         if pin:
             Label(sub, text='pin%d' % i).grid(row=curr_row, column=0)
             Label(sub, text='|').grid(row=curr_row, column=1)
             stat = Label(sub)
-            rows.append((pin, stat))
             stat.grid(row=curr_row, column=2, sticky=W)
+            rate = Label(sub, text='0')
+            rate.grid(row=curr_row, column=3, sticky=E)
+            rows.append([pin, stat, '', rate, pin._writes])
             curr_row += 1
 
-    # mainloop
-    while 1:
-        for pin, stat in rows:
-            # occupied pins
-            if pin.id == 12:
-                stat.config(text='Reserved pin')
-            elif pin.id in (5, 11):
-                stat.config(text='Occupied by button %s' % 'AB' [pin.id == 11])
-            elif pin.id in (3, 4, 6, 7, 9, 10) and _pin.screen_mode:
-                stat.config(text='Occupied by LED screen')
-
-            # IO pins
-            else:
-                time_format = lambda x: '%d mus' % x if x < 1000 else '%s ms' % (x / 1000)
-                if pin.volt > 0:
-                    info = 'Output : '
-                    if pin.volt == 1023:
-                        info += 'ONE (digital)'
-                    else:
-                        info += '%d (analog); PWM cycle period: %s' % (
-                            pin.volt, time_format(pin.period))
-                elif pin.volt_r > 0:
-                    info = 'Input : '
-                    if pin.volt_r == 1023:
-                        info += 'ONE (digital)'
-                    else:
-                        info += '%d (analog); PWM cycle period: %s' % (
-                            pin.volt_r, time_format(pin.period_r))
-                else:
-                    info = 'spare'
-
-                stat.config(text=info)
-
-        assert pin_info.running
-        sub.update()
+    # update
+    last_rate = [perf_counter()]
+
+    def update():
+        # status changed since shown
+        for row in rows:
+            info = _pin_status(row[0])
+            if info != row[2]:
+                row[2] = info
+                row[1].config(text=info)
+
+        # write rate, once a second
+        now = perf_counter()
+        dt = now - last_rate[0]
+        if dt >= 1:
+            last_rate[0] = now
+            for row in rows:
+                writes = row[0]._writes
+                if writes != row[4]:
+                    row[3].config(text='%d' % ((writes - row[4]) / dt))
+                    row[4] = writes
+                elif row[3]['text'] != '0':
+                    row[3].config(text='0')
+
+    _repeat(sub, update, pin_refresh_ms)
+    return sub
+
+
+def _time_format(x):
+    return '%d mus' % x if x < 1000 else '%s ms' % (x / 1000)
+
+
+# status text of a pin
+def _pin_status(pin):
+    # occupied pins
+    if pin.id == 12:
+        return 'Reserved pin'
+    elif pin.id in (5, 11):
+        return 'Occupied by button %s' % 'AB' [pin.id == 11]
+    elif pin.id in (3, 4, 6, 7, 9, 10) and _pins.screen_mode:
+        return 'Occupied by LED screen'
+
+    # IO pins
+    if pin.volt > 0:
+        info = 'Output : '
+        if pin.volt == 1023:
+            info += 'ONE (digital)'
+        else:
+            info += '%d (analog); PWM cycle period: %s' % (
+                pin.volt, _time_format(pin.period))
+    elif pin.volt_r > 0:
+        info = 'Input : '
+        if pin.volt_r == 1023:
+            info += 'ONE (digital)'
+        else:
+            info += '%d (analog); PWM cycle period: %s' % (
+                pin.volt_r, _time_format(pin.period_r))
+    else:
+        info = 'spare'
+    return info
 
 
 # a beeper
-def beeper():
+def beeper(master):
 
     # init
-    sub = Tk()
+    sub = Toplevel(master)
     sub.title('Beeper')
     sub.resizable(0, 0)
 
     # layout
     Label(sub, text='Pin connected:', anchor=W).pack(fill=X)
-    pin_select = IntVar(sub, value=0)
-    cur_pin_id = 0
+    pin_select = IntVar(
+        sub, value=_pins.music_pin.id if _pins.music_pin else -1)
+
+    def select():
+        pin_id = pin_select.get()
+        _pins.music_pin = _pins.pins[pin_id] if pin_id >= 0 else None
+
     pin_group = Frame(sub)
     pin_group.pack(fill=X)
     Radiobutton(
-        pin_group, variable=pin_select, text='none', value=-1).pack(side=LEFT)
+        pin_group, variable=pin_select, text='none', value=-1,
+        command=select).pack(side=LEFT)
     for i in [0, 1, 2, 8]:
         Radiobutton(
-            pin_group, variable=pin_select, text='pin%d' % i,
-            value=i).pack(side=LEFT)
+            pin_group,
+            variable=pin_select,
+            text='pin%d' % i,
+            value=i,
+            command=select).pack(side=LEFT)
 
-    # mainloop
-    while 1:
-        assert beeper.running
-        pin_id = pin_select.get()
-        _pin.music_pin = _pin.pins[pin_id] if pin_id >= 0 else None
-        sub.update()
+    return sub
 
 
 # spatial rotation control for accelerometer
-def rotation():
-    sub = Tk()
+def rotation(master):
+    sub = Toplevel(master)
     sub.title('Spatial rotation')
     cv = Canvas(sub, width=400, height=400, bg='#66ccff')
     cv.pack()
@@ -151,12 +201,14 @@ def rotation():
         outline='black',
         fill='gray' if spatial.r_matrix[2][2] < 0 else 'orange')
 
-    # control spatial angle
-    def drag_event(e):
-        x = e.x - sub.winfo_width() / 2
-        y = e.y - sub.winfo_height() / 2
-        spatial.r_matrix = spatial.rotatey(x * 0.01) * spatial.rotatex(
-            -y * 0.01) * spatial.def_matrix
+    # redraw when rotation changed, also by replay
+    drawn = [spatial.r_matrix]
+
+    def update():
+        if drawn[0] is spatial.r_matrix:
+            return
+        drawn[0] = spatial.r_matrix
+
         # update axis
         axis_ends = tuple(get_axis_ends())
         for i in range(3):
@@ -175,15 +227,22 @@ def rotation():
         cv.itemconfig(
             body, fill='gray' if spatial.r_matrix[2][2] < 0 else 'orange')
 
+    # control spatial angle
+    def drag_event(e):
+        x = e.x - sub.winfo_width() / 2
+        y = e.y - sub.winfo_height() / 2
+        feed('rotation', spatial.rotatey(x * 0.01) * spatial.rotatex(
+            -y * 0.01) * spatial.def_matrix)
+        update()
+
     cv.bind('<B1-Motion>', drag_event)
-    while 1:
-        assert rotation.running
-        sub.update()
+    _repeat(sub, update)
+    return sub
 
 
-def gesture_info():
+def gesture_info(master):
     # initialize tk
-    sub = Tk()
+    sub = Toplevel(master)
     sub.title('Gesture control')
     frame = Frame(sub)
     frame.pack(fill=X)
@@ -191,13 +250,7 @@ def gesture_info():
 
     # gesture buttons
     def button_func(g):
-        def command():
-            if gesture.curr != g:
-                gesture.sequence.append(g)
-            gesture.curr = g
-            gesture.appeared[g] = True
-
-        return command
+        return lambda: feed('gesture', g)
 
     buttons = {}
     for g_group in ("up", "down", "left", "right", "face up",
@@ -210,15 +263,10 @@ def gesture_info():
             button.pack(side=LEFT)
 
     # clear button
-    def clear_gestures():
-        gesture.sequence = []
-        for g in gesture.all:
-            gesture.appeared[g] = False
-
     frame = Frame(sub)
     frame.pack(fill=X)
     Label(frame, text='Gestures recorded:').pack(side=LEFT)
-    Button(frame, text='Clear', command=clear_gestures).pack()
+    Button(frame, text='Clear', command=lambda: feed('clear_gestures')).pack()
 
     # show gesture sequence
     glist = Label(sub, justify=LEFT)
@@ -226,9 +274,7 @@ def gesture_info():
     max_display = 15
     display_content = ['aa'] * max_display
 
-    while 1:
-        assert gesture_info.running
-
+    def update():
         # button color
         for g in gesture.all:
             buttons[g].config(bg='orange' if gesture.curr == g else '#66ccff'
@@ -249,11 +295,12 @@ def gesture_info():
 
         glist.config(text='\n'.join(display_content))
 
-        sub.update()
+    _repeat(sub, update)
+    return sub
 
 
-def compass_control():
-    sub = Tk()
+def compass_control(master):
+    sub = Toplevel(master)
     sub.title('Magnetic field direction')
     cv = Canvas(sub, width=400, height=400, bg='#66ccff')
     cv.pack()
@@ -284,29 +331,37 @@ def compass_control():
     mag_arrow = cv.create_polygon(
         *[get_mag_pos(x, y) for x, y in arrow_sketch], fill='black')
 
+    # redraw when rotation or field changed
+    drawn = [spatial.r_matrix, magnetic.direction]
+
+    def update():
+        if drawn[0] is not spatial.r_matrix:
+            drawn[0] = spatial.r_matrix
+
+            # update body
+            coords = []
+            for pt in body_sketch:
+                coords.extend(get_point_pos(*pt))
+            cv.coords(body, *coords)
+            cv.itemconfig(
+                body, fill='gray' if spatial.r_matrix[2][2] < 0 else 'orange')
+
+        if drawn[1] != magnetic.direction:
+            drawn[1] = magnetic.direction
+
+            # update arrow
+            coords = []
+            for pt in arrow_sketch:
+                coords.extend(get_mag_pos(*pt))
+            cv.coords(mag_arrow, *coords)
+
     # control magnetic field angle
     def drag_event(e):
         x = e.x - sub.winfo_width() / 2
         y = e.y - sub.winfo_height() / 2
-        magnetic.direction = atan2(y, x)
-        magnetic.str_x = magnetic.strength * cos(magnetic.direction)
-        magnetic.str_y = magnetic.strength * sin(magnetic.direction)
-        coords = []
-        for pt in arrow_sketch:
-            coords.extend(get_mag_pos(*pt))
-        cv.coords(mag_arrow, *coords)
+        feed('magnetic', atan2(y, x))
+        update()
 
     cv.bind('<B1-Motion>', drag_event)
-
-    while 1:
-        assert compass_control.running
-        
-        # update body
-        coords = []
-        for pt in body_sketch:
-            coords.extend(get_point_pos(*pt))
-        cv.coords(body, *coords)
-        cv.itemconfig(
-            body, fill='gray' if spatial.r_matrix[2][2] < 0 else 'orange')
-
-        sub.update()
+    _repeat(sub, update)
+    return sub
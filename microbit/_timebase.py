@@ -1,5 +1,13 @@
 __doc__ = '''Extend of microbit module
-several timing functions
+several timing functions, driven by a pluggable clock
+- real: wall clock (default)
+- scaled: wall clock running n times faster
+- virtual: simulated time, sleep returns instantly
+
+each board has its own clock & timed events,
+clock is read from environment variable MICROBIT_CLOCK when a board starts
+('real', 'virtual' or a speed factor like '10'),
+and may be switched later with microbit.init(clock=...)
 
 Extension of microbit:
 - method
@@ -8,18 +16,217 @@ Extension of microbit:
 '''
 __all__ = ['sleep', 'running_time']
 
-from time import sleep as _sleep, perf_counter as _time
+from time import sleep as _sleep, perf_counter as _perf
+from threading import Condition, main_thread, current_thread
+from heapq import heappush, heappop
+from itertools import count
+from traceback import print_exc
+from contextvars import copy_context
+from os import environ
+from . import _board
 
 
-def sleep(ms):
-    '''Wait for n milliseconds.'''
-    _sleep(ms / 1000)  # turn into seconds
+# ============ clocks ============
+class _real_clock:
+    '''wall clock, optionally sped up by a factor'''
+
+    def __init__(self, scale=1, start=0):
+        self.scale = scale
+        self._offset = _perf() - start / scale
+
+    def time(self):
+        return (_perf() - self._offset) * self.scale
+
+    def sleep_until(self, t):
+        dt = t - self.time()
+        if dt > 0:
+            _sleep(dt / self.scale)
+
+
+class _virtual_clock:
+    '''simulated time advanced by sleeps of the driving thread
+    (main thread for the default board, else the first one to sleep)
+    other threads wait until it catches up with them'''
+    scale = float('inf')
+
+    def __init__(self, events, start=0, driver=None):
+        self.now = start
+        self.events = events
+        self.driver = driver
+        self._cond = Condition()
+
+    def time(self):
+        return self.now
+
+    def sleep_until(self, t):
+        # wait for driving thread to move time on
+        if self.driver is None:
+            self.driver = current_thread()
+        driver = self.driver
+        while current_thread() is not driver and driver.is_alive():
+            with self._cond:
+                if self.now >= t:
+                    return
+                self._cond.wait(0.05)
+
+        # driver (or anyone after it ends) moves time,
+        # running timed events on the way
+        events = self.events
+        while 1:
+            with events.cond:
+                ev = events.pop_due(t)
+            if ev is None:
+                break
+            self._advance(ev[0])
+            _call(ev)
+        self._advance(t)
+
+    def _advance(self, t):
+        with self._cond:
+            if t > self.now:
+                self.now = t
+                self._cond.notify_all()
+
+
+def _new_clock(mode, now=0):
+    if mode == 'virtual':
+        board = _board.current()
+        driver = main_thread() if board is _board.default else None
+        return _virtual_clock(board.events, now, driver)
+    elif mode == 'real':
+        return _real_clock(1, now)
+    scale = float(mode)
+    if scale <= 0:
+        raise ValueError('clock speed must be positive')
+    return _real_clock(scale, now)
+
+
+def set_clock(mode='real'):
+    '''switch clock of current board to 'real', 'virtual' or a speed factor,
+    running time continues from current value'''
+    board = _board.current()
+    board.clock = _new_clock(mode, board.clock.time())
+
+    # let worker follow the new clock
+    with board.events.cond:
+        board.events.start_worker(board.clock)
+        board.events.cond.notify()
+
+
+# ============ timed events ============
+class _events:
+    '''timed events of a board: heap of [time, order, func, args, context],
+    func set to None when cancelled'''
+
+    def __init__(self):
+        self.heap = []
+        self.order = count()
+        self.cond = Condition()
+        self.worker = None
+        self.closed = False
 
+    # earliest event due before t, caller holds cond
+    def pop_due(self, t):
+        heap = self.heap
+        while heap and heap[0][2] is None:
+            heappop(heap)
+        if heap and heap[0][0] <= t:
+            return heappop(heap)
 
-_init_time = _time()
+    # worker thread, only real clocks need it, caller holds cond
+    def start_worker(self, clock):
+        if self.worker is None and self.heap and not self.closed and \
+                clock.scale != float('inf'):
+            self.worker = _board.spawn(self.run)
+            self.worker.start()
+
+    def run(self):
+        board = _board.current()
+        with self.cond:
+            while not self.closed:
+                clock = board.clock
+                ev = None
+                if clock.scale != float('inf'):
+                    ev = self.pop_due(clock.time())
+                if ev:
+                    self.cond.release()
+                    try:
+                        _call(ev)
+                    finally:
+                        self.cond.acquire()
+                elif self.heap and clock.scale != float('inf'):
+                    self.cond.wait((self.heap[0][0] - clock.time()) /
+                                   clock.scale)
+                else:
+                    self.cond.wait()
+
+    def close(self):
+        '''drop pending events & stop the worker'''
+        with self.cond:
+            self.closed = True
+            self.heap.clear()
+            self.cond.notify()
+        worker, self.worker = self.worker, None
+        if worker and worker is not current_thread():
+            worker.join()
+
+
+def call_at(t, func, *args):
+    '''run func(*args) when simulated time of current board reaches t seconds,
+    in the context (board) it was scheduled from
+    real clocks run it on a single worker thread per board,
+    the virtual clock runs it inside sleep of the driving thread'''
+    board = _board.current()
+    events = board.events
+    ev = [t, next(events.order), func, args, copy_context()]
+    with events.cond:
+        heappush(events.heap, ev)
+        events.start_worker(board.clock)
+        events.cond.notify()
+    return ev
+
+
+def cancel(ev):
+    '''cancel an event returned by call_at'''
+    ev[2] = None
+
+
+def _call(ev):
+    func = ev[2]
+    if func:
+        try:
+            ev[4].run(func, *ev[3])
+        except Exception:
+            print_exc()
+
+
+_board.part('events', _events)
+_board.part('clock', lambda: _new_clock(environ.get('MICROBIT_CLOCK') or 'real'))
+
+
+# ============ time functions ============
+def _time():
+    '''current simulated time in seconds'''
+    return _board.current().clock.time()
+
+
+def _wait(sec):
+    '''wait for some simulated seconds'''
+    clock = _board.current().clock
+    clock.sleep_until(clock.time() + sec)
+
+
+def _sleep_until(t):
+    '''wait until simulated time reaches t seconds'''
+    _board.current().clock.sleep_until(t)
+
+
+def sleep(ms):
+    '''Wait for n milliseconds.'''
+    _wait(ms / 1000)  # turn into seconds
 
 
 def running_time():
     '''Return the number of milliseconds since the board was switched on or
     restarted.'''
-    return (_time() - _init_time) * 1000
+    return _board.current().clock.time() * 1000
@@ -1,5 +1,6 @@
 __doc__ = '''accelerometer module
-simulates gravity and gestures saparately
+simulates gravity, gestures are recognized from it (see _gesture)
+or added by hand from the gesture panel
 
 Containment:
 - method
@@ -13,33 +14,39 @@ Containment:
 -- microbit.accelerometer.get_gestures
 '''
 
-from ._hardware import spatial, gesture
+from ._hardware import spatial, gesture, _sample
+from ._gesture import track
 
 if 'numeric value':
-    _g = 1024
 
     def get_x():
-        return -int(_g * spatial.r_matrix[0][2])
+        return get_values()[0]
 
     def get_y():
-        return -int(_g * spatial.r_matrix[1][2])
+        return get_values()[1]
 
     def get_z():
-        return -int(_g * spatial.r_matrix[2][2])
+        return get_values()[2]
 
     def get_values():
-        return get_x(), get_y(), get_z()
+        if spatial.source:
+            track()  # before values move on past unread samples
+            return _sample(spatial.source)
+        return spatial.accel
 
 
 if 'gesture':
 
     def current_gesture():
+        track()
         return gesture.curr
 
     def is_gesture(name):
+        track()
         return gesture.curr == name
 
     def was_gesture(name):
+        track()
         res = gesture.appeared[name]
         for g in gesture.all:
             gesture.appeared[g] = False
@@ -47,6 +54,7 @@ if 'gesture':
         return res
 
     def get_gestures():
+        track()
         res = tuple(gesture.sequence)
         gesture.sequence = []
         return res
\ No newline at end of file
@@ -0,0 +1,250 @@
+__doc__ = '''Batch runner
+run many scripts headlessly on the virtual clock, spread over processes
+
+    python -m microbit.batch "snake game.py" more/*.py -i inputs.jsonl -o out.json
+
+each worker process imports microbit once and runs its scripts one by one,
+every script on a fresh Board; a script ends by itself, by an error,
+or when it runs out of simulated time (--sim-time) or wall-clock time
+(--wall-time, interrupts running Python code of the script)
+
+result of each script, as JSON:
+- status: 'ok', 'exit', 'error', 'sim_timeout', 'wall_timeout' or 'crashed'
+- running_time & wall_time in ms
+- display: final LEDs as 5 rows of lightness digits
+- pins: pins written to, {id: [volt, period_us]}
+- music: tones [pin, frequency, start_ms, end_ms]
+- output: printed text, error: traceback
+
+Containment:
+- class
+-- out_of_time
+-- sim_timeout
+-- wall_timeout
+- method
+-- run_script
+-- run_all
+-- main
+'''
+__all__ = [
+    'out_of_time', 'sim_timeout', 'wall_timeout', 'run_script', 'run_all',
+    'main'
+]
+
+import sys
+from os import environ
+from os.path import abspath, dirname
+from io import StringIO
+from json import dump
+from random import seed as _seed
+from runpy import run_path
+from argparse import ArgumentParser
+from contextlib import redirect_stdout
+from ctypes import pythonapi, py_object, c_ulong
+from queue import SimpleQueue
+from threading import Timer, Lock, get_ident
+from time import perf_counter
+from traceback import format_exc
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from ._board import Board
+from ._timebase import call_at, running_time
+from . import _input_trace
+
+
+# ============ budgets ============
+# BaseException, so that "except Exception" in scripts cannot catch them
+class out_of_time(BaseException):
+    '''stops a script that used up its budget'''
+    status = None
+
+
+class sim_timeout(out_of_time):
+    status = 'sim_timeout'
+
+
+class wall_timeout(out_of_time):
+    status = 'wall_timeout'
+
+
+def _stop(exc):
+    raise exc()
+
+
+class _watchdog:
+    '''raise wall_timeout in the running thread after some seconds'''
+
+    def __init__(self, seconds):
+        self.seconds = seconds
+        self._lock = Lock()
+        self._armed = False
+
+    def __enter__(self):
+        if self.seconds is not None:
+            self._thread = get_ident()
+            self._armed = True
+            self._timer = Timer(self.seconds, self._fire)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def __exit__(self, *exc):
+        with self._lock:
+            if self._armed:
+                self._armed = False
+                self._timer.cancel()
+
+    def _fire(self):
+        with self._lock:
+            if self._armed:
+                self._armed = False
+                pythonapi.PyThreadState_SetAsyncExc(
+                    c_ulong(self._thread), py_object(wall_timeout))
+
+
+# ============ single script ============
+def run_script(path,
+               inputs=None,
+               sim_time=60,
+               wall_time=10,
+               seed=0,
+               board=None):
+    '''run a script on board, a fresh one with the virtual clock by default,
+    closed afterwards
+    inputs: input trace (path or loaded list) replayed from the start
+    sim_time & wall_time: budgets in seconds, None for no limit
+    seed: for the random module
+    returns result dict'''
+    if board is not None:
+        return board.run(_run, board, path, inputs, sim_time, wall_time, seed)
+    board = Board(clock='virtual')
+    try:
+        return board.run(_run, board, path, inputs, sim_time, wall_time, seed)
+    finally:
+        board.close()  # nothing of the script outlives it in the worker
+
+
+def _run(board, path, inputs, sim_time, wall_time, seed):
+    tones = SimpleQueue()  # announced by pins, see _audio
+    board.pins.listeners.append(tones)
+    if inputs:
+        _input_trace.replay(inputs)
+    if sim_time is not None:
+        call_at(sim_time, _stop, sim_timeout)
+
+    result = {'script': path, 'status': 'ok'}
+    out = StringIO()
+    folder = dirname(abspath(path))
+    sys.path.insert(0, folder)  # as if run by python itself
+    start = perf_counter()
+    try:
+        with _watchdog(wall_time), redirect_stdout(out):
+            _seed(seed)
+            run_path(path, run_name='__main__')
+    except out_of_time as e:
+        result['status'] = e.status
+    except SystemExit:
+        result['status'] = 'exit'
+    except BaseException:
+        result['status'] = 'error'
+        result['error'] = format_exc()
+    finally:
+        sys.path.remove(folder)
+        board.pins.listeners.remove(tones)
+
+    result['running_time'] = running_time()
+    result['wall_time'] = (perf_counter() - start) * 1000
+    frame = board.leds.frame
+    result['display'] = [
+        ''.join(map(str, frame[y * 5:y * 5 + 5])) for y in range(5)
+    ]
+    result['pins'] = {
+        pin.id: [pin.volt, pin.period]
+        for pin in board.pins.pins if pin and pin._writes
+    }
+    result['music'] = _tone_trace(tones)
+    result['output'] = out.getvalue()
+    return result
+
+
+# tones played, a new tone on a pin cuts the last one like in _audio.mixer
+def _tone_trace(tones):
+    trace, last = [], {}
+    while not tones.empty():
+        pin, freq, start, end, duty = tones.get()
+        tone = last.get(pin.id)
+        if tone and tone[3] > start:
+            tone[3] = max(start, tone[2])
+        if freq > 0:
+            tone = last[pin.id] = [pin.id, freq, start, end]
+            trace.append(tone)
+    return [[p, f, round(a * 1000, 3), round(b * 1000, 3)]
+            for p, f, a, b in trace]
+
+
+# ============ process pool ============
+def _init_worker():
+    import music  # loaded once per worker, not per script
+
+
+def run_all(paths, jobs=None, **kwargs):
+    '''run scripts in a pool of jobs worker processes (one per CPU by default),
+    kwargs go to run_script; yields results in order of paths'''
+    environ.setdefault('MICROBIT_BACKEND', 'headless')  # for new workers
+    with ProcessPoolExecutor(jobs, initializer=_init_worker) as pool:
+        futures = [pool.submit(run_script, path, **kwargs) for path in paths]
+        for path, future in zip(paths, futures):
+            try:
+                yield future.result()
+            except BrokenProcessPool:  # worker killed by the script
+                yield {'script': path, 'status': 'crashed'}
+
+
+def main(argv=None):
+    parser = ArgumentParser(
+        prog='python -m microbit.batch',
+        description='run micro:bit scripts headlessly with simulated time')
+    parser.add_argument('scripts', nargs='+')
+    parser.add_argument(
+        '-i', '--inputs', help='input trace replayed for every script')
+    parser.add_argument(
+        '-j', '--jobs', type=int, help='worker processes, one per CPU')
+    parser.add_argument(
+        '--sim-time', type=float, default=60,
+        help='simulated seconds per script (60)')
+    parser.add_argument(
+        '--wall-time', type=float, default=10,
+        help='wall-clock seconds per script (10)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument(
+        '-o', '--output', help='JSON file for results, stdout by default')
+    args = parser.parse_args(argv)
+
+    inputs = args.inputs and _input_trace.load(args.inputs)
+    results = list(
+        run_all(
+            args.scripts,
+            args.jobs,
+            inputs=inputs,
+            sim_time=args.sim_time,
+            wall_time=args.wall_time,
+            seed=args.seed))
+    if args.output:
+        with open(args.output, 'w') as f:
+            dump(results, f, indent=1)
+    else:
+        dump(results, sys.stdout, indent=1)
+        print()
+
+    # summary
+    counts = {}
+    for r in results:
+        counts[r['status']] = counts.get(r['status'], 0) + 1
+    print(
+        ', '.join('%s: %d' % item for item in sorted(counts.items())),
+        file=sys.stderr)
+    failed = ('error', 'wall_timeout', 'crashed')
+    return int(any(r['status'] in failed for r in results))
+
+
+if __name__ == '__main__':
+    sys.exit(main())
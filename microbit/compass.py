@@ -16,51 +16,53 @@ __all__ = [
     'get_z', 'heading', 'is_calibrated'
 ]
 
-from ._hardware import spatial, magnetic
+from ._hardware import magnetic, _sample
 from .display import show, Image
-from math import atan2, pi
-
-_done = False
 
 
 def calibrate():
     show([Image('09090:09090:00000:90009:09990')], 1000)
-    global _done
-    _done = True
+    magnetic.calibrated = True
 
 
 def is_calibrated():
-    return _done
+    return magnetic.calibrated
 
 
 def clear_calibration():
-    global _done
-    _done = False
+    magnetic.calibrated = False
+
+
+# current field, from sample stream if attached
+def _field():
+    if magnetic.source:
+        return _sample(magnetic.source)
+    return magnetic.field
 
 
 def get_x():
-    assert _done
-    return int(magnetic.str_x * spatial.r_matrix[0][0] +
-               magnetic.str_y * spatial.r_matrix[0][1])
+    assert magnetic.calibrated
+    return _field()[0]
 
 
 def get_y():
-    assert _done
-    return int(magnetic.str_x * spatial.r_matrix[1][0] +
-               magnetic.str_y * spatial.r_matrix[1][1])
+    assert magnetic.calibrated
+    return _field()[1]
 
 
 def get_z():
-    assert _done
-    return int(magnetic.str_x * spatial.r_matrix[2][0] +
-               magnetic.str_y * spatial.r_matrix[2][1])
+    assert magnetic.calibrated
+    return _field()[2]
 
 
 def heading():
-    assert _done
-    return (int(-90 - atan2(get_y(), get_x()) * 180 / pi) + 360) % 360
+    assert magnetic.calibrated
+    if magnetic.source:
+        x, y, z = _field()
+        return magnetic.heading_of(x, y)
+    return magnetic.heading
 
 
 def get_field_strength():
-    assert _done
+    assert magnetic.calibrated
     return magnetic.strength
\ No newline at end of file
@@ -10,6 +10,7 @@ Containment:
 -- microbit.display.clear
 -- microbit.display.show
 -- microbit.display.scroll
+-- microbit.display.show_buffer
 
 Extension of microbit:
 - class:
@@ -18,13 +19,17 @@ Extension of microbit:
 -- microbit.panic
 '''
 __all__ = [
-    'on', 'off', 'is_on', 'get_pixel', 'set_pixel', 'clear', 'show', 'scroll'
+    'on', 'off', 'is_on', 'get_pixel', 'set_pixel', 'clear', 'show', 'scroll',
+    'show_buffer'
 ]
 
-from threading import Thread
-from ._timebase import sleep, _time
-from ._screen import LED
-from ._hardware import _pin
+from threading import Lock
+from operator import add as _add, sub as _sub
+from functools import lru_cache, partial
+from ._timebase import sleep, _time, _sleep_until, call_at as _call_at, \
+    cancel as _cancel
+from ._hardware import _pins, LED
+from . import _numpy_image as _np_image, _font_data, _board
 
 
 # ============ root content ============
@@ -37,51 +42,71 @@ def panic(error_code=0):
         sleep(400)
 
 
+# lookup tables for bytearray.translate & pixel arithmetic
+_digits = bytes(i - 48 if 48 <= i < 58 else 255 for i in range(256))  # '0'->0
+_chars = bytes(range(48, 58)) + b'?' * 246  # 0->'0'
+_invert = bytes(range(9, -1, -1)) + bytes(246)
+_add_sat = bytes(min(i, 9) for i in range(19))  # sum of 2 pixels -> 0..9
+_sub_sat = bytes(range(10)) + bytes(9)  # difference, negative index -> 0
+
+
+# parse a string of digits into pixels
+def _parse_pixels(s):
+    data = bytearray(s, 'ascii').translate(_digits)
+    if data and max(data) > 9:
+        raise ValueError('invalid pixel in %r' % s)
+    return data
+
+
 # Image class defination
 class Image:
-    # compile inner images
-    @staticmethod
-    def _inner_image(s):
-        img = Image(s)
-        for fun in ['set_pixel', 'fill', 'blit']:
-            img.__setattr__(fun, Image._inner_attempt_modify)
+    __slots__ = ('_width', '_height', '_data', '_readonly')
 
+    # wrap pixel buffer without parsing
+    @staticmethod
+    def _new(width, height, data):
+        img = object.__new__(Image)
+        img._width, img._height, img._data = width, height, data
+        img._readonly = False
         return img
 
     # try to modify inner images
-    def _inner_attempt_modify(self, *args, **kwargs):
-        raise AttributeError('read only')
+    def _check_writable(self):
+        if self._readonly:
+            raise AttributeError('read only')
+
+    def __init__(self, *args):  # ._data format as lightness[y*width+x]
+        self._readonly = False
 
-    def __init__(self, *args):  # ._data format as lightness[x][y]
         # empty read-only 5x5
         if len(args) == 0:
             self._width = self._height = 5
-            self._data = [[0] * 5 for i in range(5)]
-            for fun in ['set_pixel', 'fill', 'blit']:
-                self.__setattr__(fun, Image._inner_attempt_modify)
+            self._data = bytearray(25)
+            self._readonly = True
 
         # from string
         elif len(args) == 1:  # from string
             s = args[0].replace(' ', '').replace('\t', '').replace('\n', ':')
             sl = [i for i in s.split(':') if i]
             self._width, self._height = len(sl[0]), len(sl)
-            self._data = [[int(sl[y][x]) for y in range(self._height)]
-                          for x in range(self._width)]
+            self._data = _parse_pixels(''.join(
+                row[:self._width] for row in sl))
+            if len(self._data) != self._width * self._height:
+                raise ValueError('rows of different length')
 
         # with specific width and height
         else:
             self._width, self._height = args[:2]
-            self._data = [[0] * self._height for i in range(self._width)]
+            self._data = bytearray(self._width * self._height)
             if len(args) > 2:
                 s = args[2].replace(':', '').replace(' ', '').replace(
                     '\t', '').replace('\n', '')
-                for i in range(min(len(s), self._width * self._height)):
-                    self._data[i % self._width][i // self._width] = int(s[i])
+                buf = _parse_pixels(s[:len(self._data)])
+                self._data[:len(buf)] = buf
 
     def fill(self, value):
-        for x in range(self._width):
-            for y in range(self._height):
-                self._data[x][y] = value
+        self._check_writable()
+        self._data[:] = bytes((value, )) * len(self._data)
 
     def width(self):
         return self._width
@@ -90,36 +115,60 @@ class Image:
         return self._height
 
     def copy(self):
-        new_image = Image(0, self._height)
-        new_image._data = [col.copy() for col in self._data]
-        new_image._width = self._width
-        return new_image
+        return Image._new(self._width, self._height, self._data[:])
 
     def invert(self):
-        new_image = self.copy()
-        for x in range(new_image._width):
-            for y in range(new_image._height):
-                new_image._data[x][y] = 9 - new_image._data[x][y]
-        return new_image
+        return Image._new(self._width, self._height,
+                          self._data.translate(_invert))
 
     def set_pixel(self, x, y, value):
+        self._check_writable()
         assert isinstance(value, int) and 0 <= value <= 9
-        self._data[x][y] = value
+        if not (0 <= x < self._width and 0 <= y < self._height):
+            raise IndexError('index out of bounds')
+        self._data[y * self._width + x] = value
 
     def get_pixel(self, x, y):
-        return self._data[x][y]
+        if not (0 <= x < self._width and 0 <= y < self._height):
+            raise IndexError('index out of bounds')
+        return self._data[y * self._width + x]
 
     def blit(self, src, x, y, w, h, xdest=0, ydest=0):
-        buffer = []
-        for cx in range(max(0, -xdest), min(w, self._width - xdest)):
-            for cy in range(max(0, -ydest), min(h, self._height - ydest)):
-                if 0 <= x + cx < src._width and 0 <= y + cy < src._height:
-                    l = src._data[x + cx][y + cy]
-                else:
-                    l = 0
-                buffer.append((xdest + cx, ydest + cy, l))
-        for x, y, l in buffer:
-            self._data[x][y] = l
+        self._check_writable()
+
+        # target area inside self
+        width = self._width
+        cx0, cx1 = max(0, -xdest), min(w, width - xdest)
+        cy0, cy1 = max(0, -ydest), min(h, self._height - ydest)
+        n = cx1 - cx0
+        if n <= 0 or cy0 >= cy1:
+            return
+        if _np_image.usable(n * (cy1 - cy0), _np_image.min_blit):
+            return _np_image.blit(self, src, x, y, xdest, ydest, cx0, cx1,
+                                  cy0, cy1)
+
+        sw, sh, sdata = src._width, src._height, src._data
+        if src is self:
+            sdata = bytes(sdata)
+
+        # source columns, pixels outside source become 0
+        sx0 = x + cx0
+        lx, rx = max(sx0, 0), min(sx0 + n, sw)
+        blank = bytes(n)
+        if lx < rx:
+            lpad, rpad = bytes(lx - sx0), bytes(sx0 + n - rx)
+        else:
+            lx = rx = -1
+
+        # copy row by row
+        data = self._data
+        for cy in range(cy0, cy1):
+            d = (ydest + cy) * width + xdest + cx0
+            sy = y + cy
+            if lx >= 0 and 0 <= sy < sh:
+                data[d:d + n] = lpad + sdata[sy * sw + lx:sy * sw + rx] + rpad
+            else:
+                data[d:d + n] = blank
 
     def crop(self, x, y, w, h):
         new_img = Image(w, h)
@@ -149,161 +198,145 @@ class Image:
     def _join(self, other):  # on right
         if self._height != other._height:
             panic()
-        new_image = self.copy()
-        new_image._data.extend(x.copy() for x in other._data)
-        new_image._width += other._width
-        return new_image
+        w1, w2 = self._width, other._width
+        a, b = self._data, other._data
+        chunks = []
+        for y in range(self._height):
+            chunks.append(a[y * w1:(y + 1) * w1])
+            chunks.append(b[y * w2:(y + 1) * w2])
+        return Image._new(w1 + w2, self._height, bytearray().join(chunks))
+
+    # split pixels into rows of digits
+    def _rows(self):
+        w = self._width
+        if not w:
+            return [''] * self._height
+        s = self._data.translate(_chars).decode()
+        return [s[i:i + w] for i in range(0, len(s), w)]
 
     def __repr__(self):
-        return ':'.join(''.join(
-            str(self._data[x][y]) for x in range(self._width))
-                        for y in range(self._height))
+        return ':'.join(self._rows())
 
     def __str__(self):
-        return '\n'.join(''.join(
-            str(self._data[x][y]) for x in range(self._width))
-                         for y in range(self._height))
+        return '\n'.join(self._rows())
+
+    # copy of self placed on a larger blank image
+    def _expand(self, width, height):
+        if (width, height) == (self._width, self._height):
+            return self.copy()
+        res = Image(width, height)
+        res.blit(self, 0, 0, self._width, self._height)
+        return res
+
+    # add (sign=1) or subtract (sign=-1) other into self with saturation
+    def _combine(self, other, sign):
+        if _np_image.usable(len(other._data), _np_image.min_combine):
+            return _np_image.combine(self, other, sign)
+
+        # row by row with a saturation table
+        op, table = (_add, _add_sat) if sign > 0 else (_sub, _sub_sat)
+        data, width, ow = self._data, self._width, other._width
+        odata = other._data
+        for y in range(other._height):
+            i = y * width
+            data[i:i + ow] = bytes(
+                map(table.__getitem__,
+                    map(op, data[i:i + ow], odata[y * ow:(y + 1) * ow])))
+        return self
 
     def __add__(self, other):
-        res = Image(
+        res = self._expand(
             max(self._width, other._width), max(self._height, other._height))
-        for x in range(self._width):
-            for y in range(self._height):
-                res._data[x][y] = self._data[x][y]
-        for x in range(other._width):
-            for y in range(other._height):
-                res._data[x][y] = min(res._data[x][y] + other._data[x][y], 9)
-        return res
+        return res._combine(other, 1)
 
     def __sub__(self, other):
-        res = Image(
+        res = self._expand(
             max(self._width, other._width), max(self._height, other._height))
-        for x in range(self._width):
-            for y in range(self._height):
-                res._data[x][y] = self._data[x][y]
-        for x in range(other._width):
-            for y in range(other._height):
-                res._data[x][y] = max(res._data[x][y] - other._data[x][y], 0)
-        return res
+        return res._combine(other, -1)
 
     def __mul__(self, n):
-        res = Image(self._width, self._height)
-        for x in range(self._width):
-            for y in range(self._height):
-                res._data[x][y] = max(0, min(self._data[x][y] * n, 9))
-        return res
+        table = bytes(max(0, min(int(v * n), 9)) for v in range(10))
+        return Image._new(self._width, self._height,
+                          self._data.translate(table + bytes(246)))
 
 
 if 'builtin images':
-    Image.HEART = Image._inner_image('09090:99999:99999:09990:00900:')
-    Image.HEART_SMALL = Image._inner_image('00000:09090:09990:00900:00000:')
-    Image.HAPPY = Image._inner_image('00000:09090:00000:90009:09990:')
-    Image.SMILE = Image._inner_image('00000:00000:00000:90009:09990:')
-    Image.SAD = Image._inner_image('00000:09090:00000:09990:90009:')
-    Image.CONFUSED = Image._inner_image('00000:09090:00000:09090:90909:')
-    Image.ANGRY = Image._inner_image('90009:09090:00000:99999:90909:')
-    Image.ASLEEP = Image._inner_image('00000:99099:00000:09990:00000:')
-    Image.SURPRISED = Image._inner_image('09090:00000:00900:09090:00900:')
-    Image.SILLY = Image._inner_image('90009:00000:99999:00909:00999:')
-    Image.FABULOUS = Image._inner_image('99999:99099:00000:09090:09990:')
-    Image.MEH = Image._inner_image('09090:00000:00090:00900:09000:')
-    Image.YES = Image._inner_image('00000:00009:00090:90900:09000:')
-    Image.NO = Image._inner_image('90009:09090:00900:09090:90009:')
-    Image.CLOCK12 = Image._inner_image('00900:00900:00900:00000:00000:')
-    Image.CLOCK1 = Image._inner_image('00090:00090:00900:00000:00000:')
-    Image.CLOCK2 = Image._inner_image('00000:00099:00900:00000:00000:')
-    Image.CLOCK3 = Image._inner_image('00000:00000:00999:00000:00000:')
-    Image.CLOCK4 = Image._inner_image('00000:00000:00900:00099:00000:')
-    Image.CLOCK5 = Image._inner_image('00000:00000:00900:00090:00090:')
-    Image.CLOCK6 = Image._inner_image('00000:00000:00900:00900:00900:')
-    Image.CLOCK7 = Image._inner_image('00000:00000:00900:09000:09000:')
-    Image.CLOCK8 = Image._inner_image('00000:00000:00900:99000:00000:')
-    Image.CLOCK9 = Image._inner_image('00000:00000:99900:00000:00000:')
-    Image.CLOCK10 = Image._inner_image('00000:99000:00900:00000:00000:')
-    Image.CLOCK11 = Image._inner_image('09000:09000:00900:00000:00000:')
-    Image.ARROW_N = Image._inner_image('00900:09990:90909:00900:00900:')
-    Image.ARROW_NE = Image._inner_image('00999:00099:00909:09000:90000:')
-    Image.ARROW_E = Image._inner_image('00900:00090:99999:00090:00900:')
-    Image.ARROW_SE = Image._inner_image('90000:09000:00909:00099:00999:')
-    Image.ARROW_S = Image._inner_image('00900:00900:90909:09990:00900:')
-    Image.ARROW_SW = Image._inner_image('00009:00090:90900:99000:99900:')
-    Image.ARROW_W = Image._inner_image('00900:09000:99999:09000:00900:')
-    Image.ARROW_NW = Image._inner_image('99900:99000:90900:00090:00009:')
-    Image.TRIANGLE = Image._inner_image('00000:00900:09090:99999:00000:')
-    Image.TRIANGLE_LEFT = Image._inner_image('90000:99000:90900:90090:99999:')
-    Image.CHESSBOARD = Image._inner_image('09090:90909:09090:90909:09090:')
-    Image.DIAMOND = Image._inner_image('00900:09090:90009:09090:00900:')
-    Image.DIAMOND_SMALL = Image._inner_image('00000:00900:09090:00900:00000:')
-    Image.SQUARE = Image._inner_image('99999:90009:90009:90009:99999:')
-    Image.SQUARE_SMALL = Image._inner_image('00000:09990:09090:09990:00000:')
-    Image.RABBIT = Image._inner_image('90900:90900:99990:99090:99990:')
-    Image.COW = Image._inner_image('90009:90009:99999:09990:00900:')
-    Image.MUSIC_CROTCHET = Image._inner_image('00900:00900:00900:99900:99900:')
-    Image.MUSIC_QUAVER = Image._inner_image('00900:00990:00909:99900:99900:')
-    Image.MUSIC_QUAVERS = Image._inner_image('09999:09009:09009:99099:99099:')
-    Image.PITCHFORK = Image._inner_image('90909:90909:99999:00900:00900:')
-    Image.XMAS = Image._inner_image('00900:09990:00900:09990:99999:')
-    Image.PACMAN = Image._inner_image('09999:99090:99900:99990:09999:')
-    Image.TARGET = Image._inner_image('00900:09990:99099:09990:00900:')
-    Image.TSHIRT = Image._inner_image('99099:99999:09990:09990:09990:')
-    Image.ROLLERSKATE = Image._inner_image('00099:00099:99999:99999:09090:')
-    Image.DUCK = Image._inner_image('09900:99900:09999:09990:00000:')
-    Image.HOUSE = Image._inner_image('00900:09990:99999:09990:09090:')
-    Image.TORTOISE = Image._inner_image('00000:09990:99999:09090:00000:')
-    Image.BUTTERFLY = Image._inner_image('99099:99999:00900:99999:99099:')
-    Image.STICKFIGURE = Image._inner_image('00900:99999:00900:09090:90009:')
-    Image.GHOST = Image._inner_image('99999:90909:99999:99999:90909:')
-    Image.SWORD = Image._inner_image('00900:00900:00900:09990:00900:')
-    Image.GIRAFFE = Image._inner_image('99000:09000:09000:09990:09090:')
-    Image.SKULL = Image._inner_image('09990:90909:99999:09990:09990:')
-    Image.UMBRELLA = Image._inner_image('09990:99999:00900:90900:09900:')
-    Image.SNAKE = Image._inner_image('99000:99099:09090:09990:00000:')
-    Image.ALL_CLOCKS = [eval('Image.CLOCK%d' % i) for i in range(1, 13)]
-    Image.ALL_ARROWS = [
-        eval('Image.ARROW_%s' % i)
-        for i in ['N', 'NE', 'E', 'SE', 'S', 'SW', 'W', 'NW']
-    ]
+    # 5x5 read-only image from a packed table of _font_data
+    def _packed_image(table, index):
+        pixels = bytearray(table[index * 25:index * 25 + 25])
+        img = Image._new(5, 5, pixels.translate(_digits))
+        img._readonly = True
+        return img
+
+    # built on first access, then stored over itself on Image
+    class _builtin:
+        def __init__(self, name, make):
+            self.name, self.make = name, make
+
+        def __get__(self, obj, cls=None):
+            value = self.make()
+            setattr(Image, self.name, value)
+            return value
+
+    for _i, _name in enumerate(_font_data.image_names):
+        setattr(Image, _name, _builtin(
+            _name, partial(_packed_image, _font_data.images, _i)))
+    del _i, _name
+    Image.ALL_CLOCKS = _builtin('ALL_CLOCKS', lambda: [
+        getattr(Image, 'CLOCK%d' % i) for i in range(1, 13)])
+    Image.ALL_ARROWS = _builtin('ALL_ARROWS', lambda: [
+        getattr(Image, 'ARROW_' + i)
+        for i in ['N', 'NE', 'E', 'SE', 'S', 'SW', 'W', 'NW']])
 
 # ============ display module ============
 if 'display':
 
     def on():
-        _pin.screen_mode = True
+        _pins.screen_mode = True
 
     def off():
-        _pin.screen_mode = False
+        _pins.screen_mode = False
         clear()
 
-    is_on = lambda: _pin.screen_mode
+    is_on = lambda: _pins.screen_mode
 
     # get lightness level of certain pixel
     def get_pixel(x, y):
-        return LED.pool[x][y].level
+        return LED.frame[y * 5 + x]
 
     # set lightness level of certain pixel
     def set_pixel(x, y, val):
-        if not _pin.screen_mode:
+        if not _pins.screen_mode:
             return
         LED.pool[x][y].set_lightness(val)
 
     # clear the screen
     def clear():
         _stop_bg_run()
-
-        for col in LED.pool:
-            for led in col:
-                led.set_lightness(0)
+        LED.commit(_blank_frame)
+
+    # show a whole frame at once: 25 lightness levels, row by row
+    # from bytes, bytearray or another buffer
+    def show_buffer(buffer):
+        frame = memoryview(buffer).tobytes()  # TypeError if not a buffer
+        if len(frame) != 25:
+            raise ValueError('buffer must hold 25 pixels, got %d' % len(frame))
+        if max(frame) > 9:
+            raise ValueError('invalid pixel in buffer')
+        _stop_bg_run()
+        if _pins.screen_mode:
+            LED.commit(frame)
 
     # display something on screen
     # distributed by input type
     def show(item, delay=None, **kwargs):  # wait=True, loop=False, clear=False
         assert type(item) in [str, Image, tuple, list]
 
-        # stop background thread
+        # stop background animation
         _stop_bg_run()
 
         # make sure screen is on
-        if not _pin.screen_mode:
+        if not _pins.screen_mode:
             return
 
         # grab arguments
@@ -318,36 +351,36 @@ if 'display':
                 while 1:
                     sleep(1000)
 
-        # show sequence in main thread
-        elif wait:
-            _show_sequence(item, delay or 400, loop, clear)
-
-        # show sequence in background
+        # show sequence in main thread or background
         else:
-            _run_bg(_show_sequence, item, delay or 400, loop, clear)
+            _play(_sequence_frames(item, delay or 400, loop, clear), wait)
 
     # show an image (first 5 columns)
-    def _show_image(item, delay=0):
-        # turn char into image
-        if isinstance(item, str):
-            item = _font.get(item, _font['?'])
-
-        # clear first
-        for col in LED.pool:
-            for led in col:
-                led.set_lightness(0)
-
-        # set all pixels
-        for x in range(min(5, item._width)):
-            for y in range(min(5, item._height)):
-                LED.pool[x][y].set_lightness(item._data[x][y])
+    def _show_image(item):
+        LED.commit(_item_frame(item))
+
+    # top-left 5x5 pixels of an image as a screen frame
+    _blank_frame = bytes(25)
+
+    def _frame_of(img):
+        w, h, data = img._width, img._height, img._data
+        if w == 5 and h >= 5:
+            return data[:25]
+        if w > 5:
+            rows = [data[y * w:y * w + 5] for y in range(min(5, h))]
+        else:
+            pad = bytes(5 - w)
+            rows = [data[y * w:y * w + w] + pad for y in range(min(5, h))]
+        return b''.join(rows) + _blank_frame[:25 - 5 * len(rows)]
 
-        # delay between frames
-        if delay:
-            sleep(delay)
+    # frame of an image or a char
+    def _item_frame(item):
+        if isinstance(item, str):
+            item = _glyph(item)
+        return _frame_of(item)
 
-    # show a sequence of iterables
-    def _show_sequence(lst, delay, loop, clear, in_thread=False):
+    # frames & delays of a sequence of images/chars
+    def _sequence_frames(lst, delay, loop, clear):
         if not lst:
             return
 
@@ -355,15 +388,10 @@ if 'display':
         while 1:
             # show each item until meeting illegal
             for item in lst:
-                # break if background thread ends
-                if in_thread and in_thread != _thread_running:
-                    return
-
-                # show image
                 if isinstance(
                         item,
                         Image) or isinstance(item, str) and len(item) == 1:
-                    _show_image(item, delay)
+                    yield _item_frame(item), delay
                 else:
                     return
 
@@ -373,60 +401,61 @@ if 'display':
 
         # clear if needed
         if clear:
-            clear()
-
-    # inner scroll a string
-    def _show_string(string, delay, wait, loop, monospace, in_thread=False):
+            yield _blank_frame, 0
+
+    # 5x5 frames of a scrolling string, built once per (string, monospace)
+    @lru_cache(maxsize=64)
+    def _scroll_frames(string, monospace):
+        # join glyphs into a long strip, row by row
+        gap = b'' if monospace else bytes(1)
+        glyphs = [_glyph(i)._data for i in string]
+        rows = []
+        for y in range(5):
+            row = [bytes(5)]
+            for g in glyphs:
+                row.append(gap)
+                row.append(g[y * 5:y * 5 + 5])
+            rows.append(b''.join(row))
+
+        # cut a window at each scroll position, blank beyond the end
+        width = len(rows[0])
+        rows = [r + bytes(4) for r in rows]
+        return tuple(b''.join(r[i:i + 5] for r in rows) for i in range(width))
+
+    # frames & delays of a scrolling string
+    def _string_frames(string, delay, loop, monospace):
         # display single character if len==1
         if len(string) == 1:
             while 1:
-                # break if background thread ends
-                if in_thread and in_thread != _thread_running:
-                    return
-
-                # show char
-                _show_image(string, delay)
+                yield _item_frame(string), delay
 
                 # break if not loop
                 if not loop:
                     break
 
-        # generate long image
-        img_start = Image()
-        for i in string:
-            if not monospace:
-                img_start = img_start._join(Image(1, 5))
-            img_start = img_start._join(_font.get(i, _font['?']))
-
-        img_show = Image(5, 5)
         # enter loop for once/forever
+        frames = _scroll_frames(string, monospace)
         while 1:
             # scroll string image
-            for i in range(img_start._width):
-                # break if background thread ends
-                if in_thread and in_thread != _thread_running:
-                    return
-
-                # draw current image & delay
-                img_show.blit(img_start, i, 0, 5, 5)
-                _show_image(img_show, delay)
+            for frame in frames:
+                yield frame, delay
 
             # break if not in loop
             if not loop:
                 break
 
         # clear afterwards
-        clear()
+        yield _blank_frame, 0
 
     # scroll string
     def scroll(string, delay=150, **kwargs):
         # wait=True, loop=False, monospace=False
 
-        # stop background thread
+        # stop background animation
         _stop_bg_run()
 
         # make sure screen is on
-        if not _pin.screen_mode:
+        if not _pins.screen_mode:
             return
 
         # grab arguments
@@ -434,123 +463,75 @@ if 'display':
         loop = kwargs.get('loop', False)
         monospace = kwargs.get('monospace', False)
 
-        # turn background if wait=False
-        if not wait:
-            kwargs['wait'] = False
-            return _run_bg(_show_string, string, delay, wait, loop, monospace)
+        _play(_string_frames(string, delay, loop, monospace), wait)
+
+
+if 'animation':
+    # the only running animation of a board, an iterator of (frame, delay)
+    # stepped at absolute times; in background it is stepped by the timed
+    # events of _timebase, replacing it cancels the pending step at once
+    class _animation_slot:
+        def __init__(self):
+            self.anim = None
+            self.lock = Lock()
+
+    _board.part('animation', _animation_slot)
+
+    class _animation:
+        def __init__(self, frames):
+            self.frames = frames
+            self.slot = _board.current().animation
+            self.t = _time()  # time of next frame
+            self.ev = None  # pending timed event
+
+        # show next frame unless replaced, False when finished
+        def step(self):
+            slot = self.slot
+            with slot.lock:
+                if slot.anim is not self:
+                    return False
+                for frame, delay in self.frames:
+                    LED.commit(frame)
+                    self.t += delay / 1000
+                    return True
+                slot.anim = None
+                return False
 
+    def _stop_bg_run():
+        slot = _board.current().animation
+        with slot.lock:
+            anim, slot.anim = slot.anim, None
+        if anim and anim.ev:
+            _cancel(anim.ev)
+
+    def _play(frames, wait):
+        anim = _animation(frames)
+        slot = anim.slot
+        with slot.lock:
+            old, slot.anim = slot.anim, anim
+        if old and old.ev:
+            _cancel(old.ev)
+
+        if wait:
+            while anim.step():
+                _sleep_until(anim.t)
         else:
-            _show_string(string, delay, wait, loop, monospace)
+            _step_bg(anim)
 
+    def _step_bg(anim):
+        if anim.step():
+            anim.ev = _call_at(anim.t, _step_bg, anim)
 
-if 'background display':
-    _thread_running = False
 
-    def _stop_bg_run():
-        global _thread_running
-        _thread_running = False
-
-    def _run_bg(fun, *args):
-        global _thread_running
-        _thread_running = _time()
-        Thread(target=fun, args=(*args, _thread_running)).start()
-
-
-# ascii font before compiled into Image
-_font = {
-    ' ': Image('00000:00000:00000:00000:00000'),
-    '!': Image('09000:09000:09000:00000:09000'),
-    '"': Image('09090:09090:00000:00000:00000'),
-    '#': Image('09090:99999:09090:99999:09090'),
-    '$': Image('09990:99009:09990:90099:09990'),
-    '%': Image('99009:90090:00900:09009:90099'),
-    '&': Image('09900:90090:09900:90090:09909'),
-    "'": Image('09000:09000:00000:00000:00000'),
-    '(': Image('00900:09000:09000:09000:00900'),
-    ')': Image('09000:00900:00900:00900:09000'),
-    '*': Image('00000:09090:00900:09090:00000'),
-    '+': Image('00000:00900:09990:00900:00000'),
-    ',': Image('00000:00000:00000:00900:09000'),
-    '-': Image('00000:00000:09990:00000:00000'),
-    '.': Image('00000:00000:00000:09000:00000'),
-    '/': Image('00009:00090:00900:09000:90000'),
-    '0': Image('09900:90090:90090:90090:09900'),
-    '1': Image('00900:09900:00900:00900:09990'),
-    '2': Image('99900:00090:09900:90000:99990'),
-    '3': Image('99990:00090:00900:90090:09900'),
-    '4': Image('00990:09090:90090:99999:00090'),
-    '5': Image('99999:90000:99990:00009:99990'),
-    '6': Image('00090:00900:09990:90009:09990'),
-    '7': Image('99999:00090:00900:09000:90000'),
-    '8': Image('09990:90009:09990:90009:09990'),
-    '9': Image('09990:90009:09990:00900:09000'),
-    ':': Image('00000:09000:00000:09000:00000'),
-    ';': Image('00000:00900:00000:00900:09000'),
-    '<': Image('00090:00900:09000:00900:00090'),
-    '=': Image('00000:09990:00000:09990:00000'),
-    '>': Image('09000:00900:00090:00900:09000'),
-    '?': Image('09990:90009:00990:00000:00900'),
-    '@': Image('09990:90009:90909:90099:09900'),
-    'A': Image('09900:90090:99990:90090:90090'),
-    'B': Image('99900:90090:99900:90090:99900'),
-    'C': Image('09990:90000:90000:90000:09990'),
-    'D': Image('99900:90090:90090:90090:99900'),
-    'E': Image('99990:90000:99900:90000:99990'),
-    'F': Image('99990:90000:99900:90000:90000'),
-    'G': Image('09990:90000:90099:90009:09990'),
-    'H': Image('90090:90090:99990:90090:90090'),
-    'I': Image('99900:09000:09000:09000:99900'),
-    'J': Image('99999:00090:00090:90090:09900'),
-    'K': Image('90090:90900:99000:90900:90090'),
-    'L': Image('90000:90000:90000:90000:99990'),
-    'M': Image('90009:99099:90909:90009:90009'),
-    'N': Image('90009:99009:90909:90099:90009'),
-    'O': Image('09900:90090:90090:90090:09900'),
-    'P': Image('99900:90090:99900:90000:90000'),
-    'Q': Image('09900:90090:90090:09900:00990'),
-    'R': Image('99900:90090:99900:90090:90009'),
-    'S': Image('09990:90000:09900:00090:99900'),
-    'T': Image('99999:00900:00900:00900:00900'),
-    'U': Image('90090:90090:90090:90090:09900'),
-    'V': Image('90009:90009:90009:09090:00900'),
-    'W': Image('90009:90009:90909:99099:90009'),
-    'X': Image('90090:90090:09900:90090:90090'),
-    'Y': Image('90009:09090:00900:00900:00900'),
-    'Z': Image('99990:00900:09000:90000:99990'),
-    '[': Image('09990:09000:09000:09000:09990'),
-    '\\': Image('90000:09000:00900:00090:00009'),
-    ']': Image('09990:00090:00090:00090:09990'),
-    '^': Image('00900:09090:00000:00000:00000'),
-    '_': Image('00000:00000:00000:00000:99999'),
-    '`': Image('09000:00900:00000:00000:00000'),
-    'a': Image('00000:09990:90090:90090:09999'),
-    'b': Image('90000:90000:99900:90090:99900'),
-    'c': Image('00000:09990:90000:90000:09990'),
-    'd': Image('00090:00090:09990:90090:09990'),
-    'e': Image('09900:90090:99900:90000:09990'),
-    'f': Image('00990:09000:99900:09000:09000'),
-    'g': Image('09990:90090:09990:00090:09900'),
-    'h': Image('90000:90000:99900:90090:90090'),
-    'i': Image('09000:00000:09000:09000:09000'),
-    'j': Image('00090:00000:00090:00090:09900'),
-    'k': Image('90000:90900:99000:90900:90090'),
-    'l': Image('09000:09000:09000:09000:00990'),
-    'm': Image('00000:99099:90909:90009:90009'),
-    'n': Image('00000:99900:90090:90090:90090'),
-    'o': Image('00000:09900:90090:90090:09900'),
-    'p': Image('00000:99900:90090:99900:90000'),
-    'q': Image('00000:09990:90090:09990:00090'),
-    'r': Image('00000:09990:90000:90000:90000'),
-    's': Image('00000:00990:09000:00900:99000'),
-    't': Image('09000:09000:09990:09000:00999'),
-    'u': Image('00000:90090:90090:90090:09999'),
-    'v': Image('00000:90009:90009:09090:00900'),
-    'w': Image('00000:90009:90009:90909:99099'),
-    'x': Image('00000:90090:09900:09900:90090'),
-    'y': Image('00000:90009:09090:00900:99000'),
-    'z': Image('00000:99990:00900:09000:99990'),
-    '{': Image('00990:00900:09900:00900:00990'),
-    '|': Image('09000:09000:09000:09000:09000'),
-    '}': Image('99000:09000:09900:09000:99000'),
-    '~': Image('00000:00000:09900:00099:00000')
-}
\ No newline at end of file
+# ascii font, glyphs built on first use
+_font = {}
+
+
+def _glyph(char):
+    img = _font.get(char)
+    if img is None:
+        index = _font_data.glyph_chars.find(char)
+        if len(char) != 1 or index < 0:
+            return _glyph('?')
+        img = _font[char] = _packed_image(_font_data.glyphs, index)
+    return img
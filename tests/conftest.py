@@ -0,0 +1,11 @@
+# simulator runs headless on the virtual clock for all tests,
+# set before microbit is first imported
+from os import environ
+from os.path import dirname, abspath
+import sys
+
+environ['MICROBIT_BACKEND'] = 'headless'
+environ['MICROBIT_CLOCK'] = 'virtual'
+root = dirname(dirname(abspath(__file__)))
+if root not in sys.path:
+    sys.path.insert(0, root)
@@ -0,0 +1,43 @@
+from microbit import Board, Image, display, sleep
+from microbit._timebase import _time
+
+
+def _replace(clock):
+    '''frames (time, frame) of a looping scroll replaced by a looping show'''
+    board = Board(clock=clock)
+    frames = []
+    board.leds.watchers.append(lambda frame: frames.append((_time(), frame)))
+
+    def script():
+        display.scroll('ABC', delay=50, wait=False, loop=True)
+        sleep(500)
+        old = board.animation.anim
+        display.show([Image.HEART, Image.SAD], delay=100, wait=False,
+                     loop=True)
+        switched = _time()
+        assert board.animation.anim is not old
+        sleep(1000)
+        display.clear()
+        return switched
+
+    try:
+        return board.run(script), frames
+    finally:
+        board.close()
+
+
+def _check(clock):
+    switched, frames = _replace(clock)
+    before = [f for t, f in frames if t < switched]
+    after = [f for t, f in frames[:-1] if t >= switched]  # last is clear
+    shapes = {bytes(Image.HEART._data), bytes(Image.SAD._data)}
+    assert len(set(before)) > 3  # scrolled a while
+    assert set(after) == shapes and len(after) >= 8  # and only shows now
+
+
+def test_new_animation_replaces_running_one():
+    _check('virtual')
+
+
+def test_replace_on_scaled_clock():
+    _check('20')  # stepped by the events worker thread
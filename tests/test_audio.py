@@ -0,0 +1,91 @@
+from threading import Event
+from queue import Queue
+from random import Random
+import pytest
+from microbit import Board, pin0
+from microbit import _audio
+
+
+def _tones(seed):
+    rnd = Random(seed)
+    return [[rnd.randrange(0, 4000), rnd.randrange(4000, 9000),
+             rnd.choice([440, 261.63, 1000, 3951]), rnd.choice([0.5, 0.25]),
+             None] for i in range(6)]
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_numpy_mix_matches_python(seed, monkeypatch):
+    pytest.importorskip('numpy')
+    tones = _tones(seed)
+    fast = _audio._mix(tones, 1000, 6000, _audio.rate)
+    monkeypatch.setattr(_audio, 'np', None)
+    monkeypatch.setattr(_audio, '_np_tried', True)
+    slow = _audio._mix(tones, 1000, 6000, _audio.rate)
+    assert fast == slow
+
+
+def test_render_length():
+    pcm = _audio.render([(440, 0, 0.5), (660, 0.25, 1)])
+    assert len(pcm) == 2 * _audio.rate
+
+
+def test_full_listener_does_not_block():
+    def script():
+        queue = Queue(2)
+        board.pins.listeners.append(queue)
+        for i in range(100):
+            pin0._tone(440, i, i + 1)
+        return queue.qsize()
+
+    board = Board(clock='virtual')
+    try:
+        assert board.run(script) == 2
+    finally:
+        board.close()
+
+
+def test_listener_removed_while_announcing():
+    got = []
+
+    class leaving:
+        def put_nowait(ev):  # like a mixer closed from another thread
+            board.pins.listeners.remove(leaving)
+
+    class staying:
+        def put_nowait(ev):
+            got.append(ev[1])
+
+    board = Board(clock='virtual')
+    try:
+        board.pins.listeners.extend([leaving, staying])
+        board.run(lambda: pin0._tone(440, 0, 1))
+        assert got == [440]
+    finally:
+        board.close()
+
+
+def test_mixer_queue_bounded():
+    assert _audio.mixer(None).events.maxsize > 0
+
+
+def test_beeper_close_does_not_wait():
+    playing, done = Event(), Event()
+
+    def beep(freq, dur):
+        playing.set()
+        done.wait(5)
+
+    board = Board(clock='real')
+    try:
+        beeper = _audio._beeper(lambda pin: True)
+        beeper.beep = beep
+        board.run(beeper.start)
+        board.run(lambda: pin0._tone(440, 0, 10))
+        assert playing.wait(5)
+        for i in range(100):  # fills the queue behind the long beep
+            board.run(lambda: pin0._tone(440, 0, 10))
+        beeper.close()  # returns while the beep still plays
+        assert not done.is_set()
+    finally:
+        done.set()
+        board.close()
@@ -0,0 +1,35 @@
+import sys
+from os import environ
+from subprocess import run
+from conftest import root
+
+
+# run code in a new interpreter without display
+def _python(code, **env):
+    base = dict(environ)
+    base.pop('DISPLAY', None)
+    base.pop('MICROBIT_BACKEND', None)
+    env = dict(base, **env)
+    return run([sys.executable, '-c', code],
+               cwd=root,
+               env=env,
+               capture_output=True,
+               text=True,
+               timeout=60)
+
+
+def test_import_without_display_runs_headless():
+    res = _python('import microbit\n'
+                  'from microbit import _backend\n'
+                  'microbit.init(backend="headless")\n'
+                  'microbit.display.scroll("hi", delay=1)\n'
+                  'print(_backend.current)')
+    assert res.returncode == 0, res.stderr
+    assert res.stdout.strip() == 'headless'
+    assert 'running headless' in res.stderr
+
+
+def test_chosen_tk_without_display_fails():
+    res = _python('import microbit', MICROBIT_BACKEND='tk')
+    assert res.returncode != 0
+    assert 'cannot open simulator window' in res.stderr
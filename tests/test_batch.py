@@ -0,0 +1,53 @@
+import gc
+import threading
+from microbit import Board
+from microbit.batch import run_script
+
+script = '''
+from microbit import *
+import music
+display.scroll('hi', delay=10, wait=False)
+music.play(['C4:1', 'D'], wait=False)
+while True:
+    pin0.write_digital(1)
+    sleep(20)
+'''
+
+
+def _boards():
+    gc.collect()
+    return sum(isinstance(o, Board) for o in gc.get_objects())
+
+
+def test_result(tmp_path):
+    path = tmp_path / 'script.py'
+    path.write_text(script)
+    res = run_script(str(path), sim_time=1)
+    assert res['status'] == 'sim_timeout'
+    assert res['running_time'] == 1000
+    assert res['pins'][0][0] == 1023
+    assert [tone[1] for tone in res['music']] == [261, 293]
+
+
+def test_no_leak_over_runs(tmp_path):
+    path = tmp_path / 'script.py'
+    path.write_text(script)
+    run_script(str(path), sim_time=1)  # warm up imports
+    threads, boards = threading.active_count(), _boards()
+    for i in range(200):
+        run_script(str(path), sim_time=0.5)
+    assert threading.active_count() == threads
+    assert _boards() == boards
+
+
+def test_errors_and_timeouts(tmp_path):
+    cases = {
+        'error': 'x = 1 / 0',
+        'exit': 'import sys; sys.exit(2)',
+        'wall_timeout': 'while True: pass',
+        'ok': 'from microbit import *; display.show("1")',
+    }
+    for status, code in cases.items():
+        path = tmp_path / (status + '.py')
+        path.write_text(code)
+        assert run_script(str(path), wall_time=0.5)['status'] == status
@@ -0,0 +1,58 @@
+from time import sleep as wait
+from threading import Barrier, Thread, active_count
+from microbit import Board, display, button_a, pin0
+from microbit import _board, Image
+from microbit._timebase import call_at
+
+
+def test_boards_keep_state_apart():
+    a, b = Board(clock='virtual'), Board(clock='virtual')
+    a.run(display.show, Image.HEART)
+    a.button_a._set_down(True)
+    a.run(lambda: pin0.write_digital(1))
+    assert b.run(display.get_pixel, 1, 0) == 0
+    assert a.run(display.get_pixel, 1, 0) == 9
+    pressed = lambda: button_a.is_pressed()  # proxy resolved in the board
+    assert (b.run(pressed), a.run(pressed)) == (False, True)
+    assert (b.run(lambda: pin0.volt), a.run(lambda: pin0.volt)) == (0, 1023)
+    assert _board.default.leds.frame != a.leds.frame
+
+
+def test_part_built_once():
+    made = []
+
+    def factory():
+        made.append(_board.current())
+        wait(0.01)  # give the other threads a chance
+        return object()
+
+    _board.part('test_part', factory)
+    board = Board(clock='virtual')
+    start = Barrier(8)
+
+    def touch(out):
+        start.wait()
+        out.append(board.test_part)
+
+    got = []
+    threads = [Thread(target=touch, args=(got, )) for _ in range(8)]
+    try:
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+    finally:
+        del _board._parts['test_part']
+    assert made == [board] and len(set(map(id, got))) == 1
+
+
+def test_close_stops_workers():
+    before = active_count()
+    boards = [Board(clock='real') for _ in range(4)]
+    for board in boards:
+        board.run(call_at, 60, print)  # starts an events worker
+    assert active_count() == before + 4
+    for board in boards:
+        board.close()
+        assert board.events.worker is None
+    assert active_count() == before
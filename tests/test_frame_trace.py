@@ -0,0 +1,39 @@
+from os.path import join
+import pytest
+from microbit import _frame_trace
+from conftest import root
+
+golden = join(root, 'tests', 'golden')
+
+
+# demo scripts at the root, frame by frame against stored traces
+@pytest.mark.parametrize('script', ['test_display', 'test_image'])
+def test_demo_matches_golden(script):
+    _frame_trace.check(
+        join(root, script + '.py'),
+        join(golden, script + '.mbft'),
+        sim_time=20)
+
+
+def test_timing_regression_caught(tmp_path):
+    with open(join(root, 'test_image.py')) as f:
+        code = f.read()
+    path = tmp_path / 'slower.py'
+    path.write_text(code.replace('sleep(100)', 'sleep(101)'))
+    with pytest.raises(AssertionError, match='at 4001.000ms'):
+        _frame_trace.check(
+            str(path), join(golden, 'test_image.mbft'), sim_time=20)
+
+
+def test_missing_golden(tmp_path):
+    with pytest.raises(AssertionError, match='no golden .* --update'):
+        _frame_trace.check(
+            join(root, 'test_image.py'), str(tmp_path / 'none.mbft'))
+
+
+def test_encode_decode():
+    frames = [(0, bytes(25)), (150, bytes(range(10)) * 2 + bytes(5)),
+              (10**9, bytes([9] * 25))]
+    data = _frame_trace.encode(frames)
+    assert _frame_trace.decode(data) == frames
+    assert len(data) < 5 + 3 * 25
@@ -0,0 +1,94 @@
+from threading import Thread
+from microbit import Board, accelerometer, sleep
+from microbit import _sensors
+from microbit._gesture import recognizer, tick
+
+
+# feed (x, y, z) postures, each held for ms, into a new recognizer
+def _gestures(*postures):
+    seen = []
+    rec = recognizer(seen.append)
+    t = 0
+    for values, ms in postures:
+        for i in range(ms // tick):
+            rec.update(t, *values)
+            t += tick
+    return seen
+
+
+flat, left, right = (0, 0, -1000), (-1000, 0, 0), (1000, 0, 0)
+
+
+def test_tilt_and_face():
+    assert _gestures((flat, 200), (left, 200), (right, 200),
+                     ((0, 0, 1000), 200)) == ['left', 'right', 'face down']
+
+
+def test_debounce():
+    # a posture shorter than the damping window is ignored
+    assert _gestures((flat, 200), (left, 60), (flat, 200)) == []
+    assert _gestures((flat, 200), (left, 120), (flat, 200)) == [
+        'left', 'face up']
+
+
+def test_force():
+    assert _gestures((flat, 200), ((0, 0, 0), 200)) == ['freefall']
+    assert _gestures((flat, 200), ((0, 0, 4000), 200)) == ['3g']
+    assert _gestures((flat, 200), ((0, 0, 9000), 200)) == ['8g']
+
+
+def test_shake():
+    seen = _gestures((flat, 200), ((1500, 0, -1000), 20),
+                     ((-1500, 0, -1000), 20), ((1500, 0, -1000), 20),
+                     ((-1500, 0, -1000), 20), ((1500, 0, -1000), 200),
+                     (flat, 1000))
+    assert seen[0] == 'shake'
+    assert seen[-1] == 'face up'
+
+
+def test_from_sensor_stream():
+    def script():
+        samples = [(t, *(left if 300 <= t < 600 else flat))
+                   for t in range(0, 1000, 10)]
+        _sensors.attach('accelerometer', _sensors.stream(samples))
+        sleep(500)
+        current = accelerometer.current_gesture()
+        sleep(400)
+        return current, accelerometer.get_gestures(), \
+            accelerometer.was_gesture('left')
+
+    board = Board(clock='virtual')
+    try:
+        current, gestures, was = board.run(script)
+    finally:
+        board.close()
+    assert current == 'left'
+    assert gestures == ('face up', 'left', 'face up')
+    assert was
+
+
+def test_track_from_threads():
+    # GUI & script threads tracking the same board at once
+    def script():
+        _sensors.attach('accelerometer', _sensors.shake(2000, hz=5))
+        threads = [Thread(target=board.run, args=(work, )) for i in range(4)]
+        for th in threads:
+            th.start()
+        for th in threads:
+            th.join()
+
+    def work():
+        try:
+            for i in range(200):
+                seen.add(accelerometer.current_gesture())
+        except Exception as e:
+            errors.append(e)
+
+    seen, errors = set(), []
+    board = Board(clock=1)
+    try:
+        board.run(script)
+    finally:
+        board.close()
+    assert not errors
+    assert seen <= {'face up', 'freefall', 'shake'}
@@ -0,0 +1,119 @@
+from random import Random
+import pytest
+from microbit import Image
+from microbit import _numpy_image
+
+
+# reference: pixels as a list of rows, every operation pixel by pixel
+class ref:
+    def __init__(self, rows):
+        self.rows = [list(r) for r in rows]
+        self.w = len(rows[0]) if rows else 0
+        self.h = len(rows)
+
+    @staticmethod
+    def blank(w, h):
+        return ref([[0] * w for y in range(h)])
+
+    def get(self, x, y):
+        if 0 <= x < self.w and 0 <= y < self.h:
+            return self.rows[y][x]
+        return 0
+
+    def blit(self, src, x, y, w, h, xdest=0, ydest=0):
+        src = ref(src.rows)  # read all before writing, for self-blit
+        for cy in range(h):
+            for cx in range(w):
+                if 0 <= xdest + cx < self.w and 0 <= ydest + cy < self.h:
+                    self.rows[ydest + cy][xdest + cx] = src.get(x + cx, y + cy)
+
+    def crop(self, x, y, w, h):
+        res = ref.blank(w, h)
+        res.blit(self, x, y, w, h)
+        return res
+
+    def shift(self, dx, dy):
+        res = ref.blank(self.w, self.h)
+        res.blit(self, 0, 0, self.w, self.h, dx, dy)
+        return res
+
+    def invert(self):
+        return ref([[9 - v for v in r] for r in self.rows])
+
+    def combine(self, other, sign):
+        res = ref.blank(max(self.w, other.w), max(self.h, other.h))
+        for y in range(res.h):
+            for x in range(res.w):
+                v = self.get(x, y) + sign * other.get(x, y)
+                res.rows[y][x] = max(0, min(v, 9))
+        return res
+
+    def scale(self, n):
+        return ref([[max(0, min(int(v * n), 9)) for v in r]
+                    for r in self.rows])
+
+    def __repr__(self):
+        return ':'.join(''.join(map(str, r)) for r in self.rows)
+
+
+def _random_pair(rnd, w, h):
+    rows = [[rnd.randrange(10) for x in range(w)] for y in range(h)]
+    text = ':'.join(''.join(map(str, r)) for r in rows)
+    return Image(text), ref(rows)
+
+
+@pytest.fixture(params=['python', 'numpy'])
+def engine(request, monkeypatch):
+    if request.param == 'numpy':
+        pytest.importorskip('numpy')
+        assert _numpy_image.usable(1, 0)  # imported
+        monkeypatch.setattr(_numpy_image, 'min_combine', 0)
+        monkeypatch.setattr(_numpy_image, 'min_blit', 0)
+    else:
+        monkeypatch.setattr(_numpy_image, 'np', None)
+        monkeypatch.setattr(_numpy_image, '_tried', True)
+    return request.param
+
+
+def test_constructors():
+    assert repr(Image('09090:99999:')) == '09090:99999'
+    assert repr(Image('12\n34\n')) == '12:34'
+    assert repr(Image(3, 2)) == '000:000'
+    assert repr(Image(3, 2, '12345')) == '123:450'
+    assert repr(Image(2, 2, '12:34:56')) == '12:34'
+    assert repr(Image()) == '00000:' * 4 + '00000'
+    with pytest.raises(ValueError):
+        Image('1a:23')
+
+
+def test_operations(engine):
+    rnd = Random(4)
+    for size in [(1, 1), (5, 5), (3, 7), (20, 20), (40, 13)]:
+        for i in range(20):
+            img, r = _random_pair(rnd, *size)
+            other, r2 = _random_pair(rnd, rnd.randint(1, 25),
+                                     rnd.randint(1, 25))
+            w, h = size
+            n = rnd.randint(-3, w + 3)
+            assert repr(img.copy()) == repr(r)
+            assert repr(img.invert()) == repr(r.invert())
+            assert repr(img + other) == repr(r.combine(r2, 1))
+            assert repr(img - other) == repr(r.combine(r2, -1))
+            k = rnd.choice([0, 0.5, 1, 1.7, 3, -1])
+            assert repr(img * k) == repr(r.scale(k))
+            assert repr(img.shift_left(n)) == repr(r.shift(-n, 0))
+            assert repr(img.shift_right(n)) == repr(r.shift(n, 0))
+            assert repr(img.shift_up(n)) == repr(r.shift(0, -n))
+            assert repr(img.shift_down(n)) == repr(r.shift(0, n))
+            box = [rnd.randint(-3, 10) for j in range(2)] + \
+                [rnd.randint(0, 12) for j in range(2)]
+            assert repr(img.crop(*box)) == repr(r.crop(*box))
+
+            # blit from another image & onto itself
+            args = [rnd.randint(-5, 25) for j in range(6)]
+            img.blit(other, *args)
+            r.blit(r2, *args)
+            assert repr(img) == repr(r)
+            img.blit(img, *args)
+            r.blit(r, *args)
+            assert repr(img) == repr(r)
@@ -0,0 +1,55 @@
+from math import cos, sin
+from microbit import Board, sleep, button_a, accelerometer, temperature, pin1
+from microbit import _input_trace
+from microbit._hardware import feed
+
+_tilt = [[1, 0, 0], [0, cos(0.5), sin(0.5)], [0, -sin(0.5), cos(0.5)]]
+
+
+def _session():
+    sleep(100)
+    feed('press', 'a')
+    sleep(50)
+    feed('rotation', _tilt)
+    feed('release', 'a')
+    sleep(50)
+    feed('temperature', 30)
+    feed('pin', 1, 1023, 1000)
+
+
+def _state():
+    return (button_a.is_pressed(), button_a.get_presses(),
+            accelerometer.get_values(), temperature(), pin1.read_digital())
+
+
+def test_record_load(tmp_path):
+    path = str(tmp_path / 'inputs.trace')
+    board = Board(clock='virtual')
+    board.run(_input_trace.record, path)
+    board.run(_session)
+    board.run(_input_trace.stop_recording)
+    board.run(feed, 'press', 'b')  # after stop, not recorded
+    assert _input_trace.load(path) == [
+        (100, 'press', ('a', )), (150, 'rotation', (_tilt, )),
+        (150, 'release', ('a', )), (200, 'temperature', (30, )),
+        (200, 'pin', (1, 1023, 1000))]
+
+
+def test_replay_on_fresh_board(tmp_path):
+    path = str(tmp_path / 'inputs.trace')
+    source = Board(clock='virtual')
+    source.run(_input_trace.record, path)
+    source.run(_session)
+    source.run(_input_trace.stop_recording)
+    want = source.run(_state)
+
+    def script():
+        _input_trace.replay(path)
+        sleep(120)
+        held = button_a.is_pressed()
+        sleep(100)
+        return held, _state()
+
+    held, got = Board(clock='virtual').run(script)
+    assert held and got == want
+    assert got[:2] == (False, 1) and got[2] != (0, 0, -1024)
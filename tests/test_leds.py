@@ -0,0 +1,31 @@
+from microbit import Board
+from microbit._hardware import _led_screen, LED
+
+
+def test_theme_per_board():
+    a, b = Board(clock='virtual'), Board(clock='virtual')
+    a.leds, b.leds  # built before any theme change
+    a.run(lambda: LED.set_theme('green'))
+    assert a.leds.palette == _led_screen.make_palette('green')
+    assert b.leds.palette == _led_screen.make_palette('red')
+    assert a.leds.palette[9] != b.leds.palette[9]
+    assert list(a.dirty) == [a.leds.redraw] and not b.dirty
+
+
+def test_redraw_uses_screen_palette():
+    board = Board(clock='virtual')
+    board.run(lambda: LED.set_theme('blue', gamma=2))
+    board.leds.commit(bytes(range(10)) + bytes(15))
+    fills = {}
+
+    class canvas:
+        def itemconfig(item, fill):
+            fills[item] = fill
+
+    for column in board.leds.pool:
+        for led in column:
+            led.inner, led.outer = ('inner', led.index), ('outer', led.index)
+    board.leds.redraw(canvas)
+    palette = _led_screen.make_palette('blue', gamma=2)
+    assert (fills['inner', 8], fills['outer', 8]) == palette[8]
+    assert board.leds.palette == palette
@@ -0,0 +1,42 @@
+from random import Random
+import pytest
+from microbit._hardware import matrix3, _spatial
+
+
+def _random(rnd):
+    return [[rnd.uniform(-2, 2) for j in range(3)] for i in range(3)]
+
+
+# plain loops over lists of rows
+def _ref_add(x, y):
+    return [[x[i][j] + y[i][j] for j in range(3)] for i in range(3)]
+
+
+def _ref_mul(x, y):
+    return [[sum(x[i][k] * y[k][j] for k in range(3)) for j in range(3)]
+            for i in range(3)]
+
+
+def _ref_apply(x, v):
+    return [sum(x[i][k] * v[k] for k in range(3)) for i in range(3)]
+
+
+def _flat(rows):
+    return [x for row in rows for x in row]
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_matches_reference(seed):
+    rnd = Random(seed)
+    x, y, v = _random(rnd), _random(rnd), _random(rnd)[0]
+    mx, my = matrix3(*x), matrix3(*y)
+    assert mx + my == matrix3(*_ref_add(x, y))
+    assert _flat(mx * my) == pytest.approx(_flat(_ref_mul(x, y)))
+    assert mx * v == pytest.approx(_ref_apply(x, v))
+
+
+def test_products_stay_matrix3():
+    r = _spatial.rotatex(0.3) * _spatial.rotatey(0.2)
+    assert type(r) is matrix3 and type(r + r) is matrix3
+    assert r == tuple(map(tuple, r)) and hash(r) == hash(tuple(r))
+    assert _spatial.def_matrix * r == r
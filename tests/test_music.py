@@ -0,0 +1,86 @@
+from threading import Thread
+from microbit import Board, sleep, pin0
+from microbit import _board
+import music
+
+
+def _tones(script, clock='virtual'):
+    '''tones (freq, start_ms) announced by pins while script runs'''
+    tones = []
+
+    class listener:
+        def put_nowait(ev):
+            if ev[1]:
+                tones.append((ev[1], round(ev[2] * 1000)))
+
+    board = Board(clock=clock)
+    try:
+        board.pins.listeners.append(listener)
+        board.run(script)
+        assert board.music.voices == {}
+    finally:
+        board.close()
+    return tones
+
+
+def test_background_replaced_at_once():
+    def script():
+        music.play(['C4:4'] * 10, wait=False)
+        sleep(1200)
+        music.play(['E4:4'], wait=False)
+        sleep(2000)
+
+    tones = _tones(script)
+    assert [f for f, t in tones] == [261, 261, 261, 329]
+    assert tones[-1][1] == 1200
+
+
+def test_stale_timer_event_plays_nothing():
+    # event of the old voice already taken by the timer thread
+    # when a new voice starts: it must not play
+    def script():
+        music.play(['C4:4'] * 10, wait=False)
+        voice = _board.current().music.voices[0]
+        music.play(['E4:4'] * 10, wait=False)
+        music._step_bgm(voice)
+        music.stop()
+        music._step_bgm(voice)
+
+    assert [f for f, t in _tones(script)] == [261, 329]
+
+
+def test_new_voice_during_timer_step():
+    # a new voice started while the timer thread steps the old one
+    # owns the pin afterwards
+    def script():
+        board = _board.current()
+        music.play(['C4:4'] * 10, wait=False)
+        voice = board.music.voices[0]
+        step = voice.step
+        other = Thread(target=board.run,
+                       args=(music.play, ['E4:4'] * 10, pin0, False))
+
+        def racing_step():
+            other.start()
+            other.join(0.2)  # blocked until this step is done
+            return step()
+
+        voice.step = racing_step
+        music._step_bgm(voice)
+        other.join()
+        music.stop()
+
+    tones = _tones(script)
+    assert [f for f, t in tones][-1] == 329
+
+
+def test_voices_from_threads():
+    # real clock: notes stepped on the timer thread while the script
+    # restarts voices
+    def script():
+        for i in range(30):
+            music.play(['C4:1', 'D', 'E'], wait=False)
+            sleep(5)
+        music.stop()
+
+    _tones(script, clock=20)
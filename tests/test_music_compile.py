@@ -0,0 +1,47 @@
+from microbit import Board
+import music
+
+
+def _on_board(func, *args):
+    return Board(clock='virtual').run(func, *args)
+
+
+def test_compile_cache_hits():
+    def script():
+        music._compile.cache_clear()
+        first = music.compile(music.NYAN)
+        again = music.compile(list(music.NYAN))
+        info = music._compile.cache_info()
+        music.set_tempo(bpm=60)
+        slower = music.compile(music.NYAN)
+        return first, again, info, slower
+
+    first, again, info, slower = _on_board(script)
+    assert again is first and (info.hits, info.misses) == (1, 1)
+    assert slower[1::2] == type(first)('d', [d * 2 for d in first[1::2]])
+    assert slower[::2] == first[::2]
+
+
+def test_cached_same_as_uncached(monkeypatch):
+    names = ('NYAN', 'ODE', 'BIRTHDAY', 'PYTHON', 'BA_DING')
+    melodies = [tuple(getattr(music, name)) for name in names]
+
+    def script():
+        music._compile.cache_clear()
+        music._parse_music_note.cache_clear()
+        return [(music.compile(m), music.compile(m)) for m in melodies]
+
+    cached = _on_board(script)
+
+    # no cache on either level
+    monkeypatch.setattr(music, '_parse_music_note',
+                        music._parse_music_note.__wrapped__)
+    plain = [music._compile.__wrapped__(m, 125.0) for m in melodies]
+    assert [cold for cold, warm in cached] == plain
+    assert [warm for cold, warm in cached] == plain
+
+
+def test_compiled_values():
+    melody = _on_board(music.compile, ['c4:4', 'd', 'r:2', 'a5'])
+    assert list(melody) == [
+        2**(-9 / 12) * 440, 500, 2**(-7 / 12) * 440, 500, 0, 250, 880, 250]
@@ -0,0 +1,127 @@
+from time import perf_counter, sleep as wait
+from pytest import fixture, raises
+from microbit import Board, sleep
+from microbit import _radio
+import radio
+
+
+@fixture
+def boards():
+    made = []
+
+    def make(n, clock='real', **config):
+        for _ in range(n):
+            board = Board(clock=clock)
+            board.run(radio.on)
+            board.run(radio.config, **config)
+            made.append(board)
+        return made[-n:]
+
+    yield make
+    for board in made:
+        board.close()
+    _radio.set_link()
+
+
+def test_group_and_channel_filter(boards):
+    a, b, c, d = boards(4)
+    c.run(radio.config, group=1)
+    d.run(radio.config, channel=20)
+    a.run(radio.send, 'hi')
+    assert b.run(radio.receive) == 'hi'
+    assert c.run(radio.receive) is None
+    assert d.run(radio.receive) is None
+    assert a.run(radio.receive) is None  # not to itself
+
+
+def test_latency(boards):
+    _radio.set_link(latency=0.2)
+    a, b = boards(2)
+    a.run(radio.send_bytes, b'late')
+    assert b.run(radio.receive_bytes) is None
+    b.run(sleep, 250)
+    assert b.run(radio.receive_bytes) == b'late'
+
+
+def test_loss_is_seeded(boards):
+    a, b = boards(2, queue=255)
+
+    def lost(seed):
+        _radio.set_link(loss=0.3, seed=seed)
+        for i in range(200):
+            a.run(radio.send_bytes, bytes((i, )))
+        got = []
+        while 1:
+            message = b.run(radio.receive_bytes)
+            if message is None:
+                return got
+            got.append(message[0])
+
+    first = lost(7)
+    assert 100 < len(first) < 180
+    assert lost(7) == first
+
+
+def test_queue_overflow_drops(boards):
+    _radio.set_link(latency=10)
+    a, b = boards(2, queue=3)
+    for i in range(10):
+        a.run(radio.send, str(i))
+    assert len(b.radio.incoming) == 3  # bounded while on the way
+    _radio.set_link()
+    for i in range(10):
+        a.run(radio.send, str(i))
+    assert len(b.radio.queue) + len(b.radio.incoming) == 3
+
+
+def test_receive_full(boards):
+    a, b = boards(2, power=7)
+    a.run(radio.send_bytes, b'\x00abc')
+    message, rssi, t = b.run(radio.receive_full)
+    assert message == b'\x00abc' and rssi == -48
+    assert 0 <= t <= b.clock.time() * 1000000
+    b.run(radio.off)
+    with raises(ValueError):
+        b.run(radio.receive_full)
+
+
+def test_virtual_clock_refused():
+    board = Board(clock='virtual')
+    with raises(ValueError):
+        board.run(radio.on)
+    assert not board.radio.on
+
+
+def test_throughput(boards):
+    a, b = boards(2, queue=255)
+    start = perf_counter()
+    for _ in range(20):
+        for i in range(200):
+            a.run(radio.send_bytes, b'x')
+        while b.run(radio.receive_bytes):
+            pass
+    assert perf_counter() - start < 2  # 4000 messages
+
+
+def test_udp_round_trip(boards):
+    (b, ) = boards(1)
+    here, there = _radio.link(), _radio.link()
+    port = 50700
+    there.transport = _radio._udp(there, port, 2, '127.0.0.1')
+    here.transport = _radio._udp(here, port, 2, '127.0.0.1')
+    _radio.bus.leave(b.radio)
+    there.join(b.radio)
+    try:
+        here.send(b.radio, b'over udp')  # b hears it through there only
+        for _ in range(100):
+            packet = there.receive(b.radio)
+            if packet:
+                break
+            wait(0.01)
+        assert packet[:2] == (b'over udp', -54)
+    finally:
+        here.transport.close()
+        there.transport.close()
+    assert not here.transport.thread.is_alive()
+    assert not there.transport.thread.is_alive()
+
@@ -0,0 +1,59 @@
+import pytest
+from microbit import _sensors
+
+
+def test_stream_interpolates():
+    s = _sensors.stream([(0, 0, 10), (100, 100, 20)])
+    assert s.at(50) == (50, 15)
+    assert s.at(200) == (100, 20)
+
+
+def test_from_csv_skips_header_and_blank_lines(tmp_path):
+    path = tmp_path / 'tilt.csv'
+    path.write_text('\n  \ntime,x,y\n0,0,10\n\n100,100,20\n\n')
+    s = _sensors.from_csv(str(path))
+    assert s.at(50) == (50, 15)
+    assert s.at(200) == (100, 20)
+
+
+def test_from_csv_rejects_text_after_header(tmp_path):
+    path = tmp_path / 'bad.csv'
+    path.write_text('time,x\n0,0\nten,1\n')
+    s = _sensors.from_csv(str(path))
+    with pytest.raises(ValueError):
+        s.at(20)
+
+
+def test_from_npy_reads_in_chunks(tmp_path, monkeypatch):
+    numpy = pytest.importorskip('numpy')
+    path = str(tmp_path / 'walk.npy')
+    data = numpy.column_stack([numpy.arange(10000) * 20.0,
+                               numpy.arange(10000) % 7])
+    numpy.save(path, data)
+
+    # rows are converted a chunk at a time, not all at once
+    converted = []
+    load = numpy.load
+    monkeypatch.setattr(
+        numpy, 'load',
+        lambda *a, **k: _Spy(load(*a, **k), converted))
+    s = _sensors.from_npy(path, chunk=100)
+    assert s.at(30) == (1.5, )
+    assert max(converted) <= 100
+    assert sum(converted) < 10000
+    assert list(s.samples(199980 - 40, 1e9)) == [
+        (199980.0 - 20, (9998 % 7, )), (199980.0, (9999 % 7, ))]
+
+
+# memory-mapped array counting rows of each slice read
+class _Spy:
+    def __init__(self, data, counts):
+        self.data, self.counts = data, counts
+
+    def __len__(self):
+        return len(self.data)
+
+    def __getitem__(self, index):
+        part = self.data[index]
+        self.counts.append(len(part))
+        return part
@@ -0,0 +1,34 @@
+from pytest import raises
+from microbit import display, Image, sleep
+
+
+def test_show_buffer_commits_frame():
+    frame = bytes(range(10)) * 2 + bytes(5)
+    display.show_buffer(bytearray(frame))
+    assert [display.get_pixel(i % 5, i // 5) for i in range(25)] == list(frame)
+    display.show_buffer(Image.HEART._data)
+    assert display.get_pixel(1, 0) == 9 and display.get_pixel(0, 0) == 0
+    display.clear()
+
+
+def test_show_buffer_checks_length_and_levels():
+    display.clear()
+    with raises(ValueError):
+        display.show_buffer(bytes(24))
+    with raises(ValueError):
+        display.show_buffer(bytes(26))
+    with raises(ValueError):
+        display.show_buffer(bytes(24) + b'\x0a')
+    with raises(TypeError):
+        display.show_buffer(25)  # bytes(25) would be a blank frame
+    with raises(TypeError):
+        display.show_buffer('0' * 25)
+    assert display.get_pixel(4, 4) == 0
+
+
+def test_show_buffer_stops_animation():
+    display.scroll('hello', wait=False)
+    display.show_buffer(bytes([5]) * 25)
+    sleep(1000)
+    assert display.get_pixel(2, 2) == 5
+    display.clear()
@@ -0,0 +1,60 @@
+from time import perf_counter
+from microbit import Board, sleep, running_time
+from microbit._timebase import call_at, cancel, _time, set_clock
+
+
+def _timed(board, ms):
+    '''(wall ms, running ms) taken by sleep(ms) on board'''
+    def script():
+        start, wall = running_time(), perf_counter()
+        sleep(ms)
+        return (perf_counter() - wall) * 1000, running_time() - start
+
+    return board.run(script)
+
+
+def test_real_clock():
+    wall, running = _timed(Board(clock='real'), 50)
+    assert 45 <= wall < 500
+    assert 50 <= running < 500
+
+
+def test_scaled_clock():
+    wall, running = _timed(Board(clock='10'), 500)
+    assert 45 <= wall < 400  # 10 times faster
+    assert 500 <= running < 4000
+
+
+def test_virtual_clock():
+    wall, running = _timed(Board(clock='virtual'), 60000)
+    assert wall < 100 and running == 60000
+
+
+def test_virtual_events_run_inside_sleep():
+    board = Board(clock='virtual')
+    seen = []
+
+    def script():
+        call_at(0.3, lambda: seen.append(('b', _time())))
+        call_at(0.1, lambda: seen.append(('a', _time())))
+        cancel(call_at(0.2, seen.append, 'cancelled'))
+        sleep(250)
+        seen.append(('slept', running_time()))
+        sleep(100)
+
+    board.run(script)
+    assert seen == [('a', 0.1), ('slept', 250), ('b', 0.3)]
+
+
+def test_switch_clock_keeps_time():
+    board = Board(clock='virtual')
+
+    def script():
+        sleep(1000)
+        set_clock('real')
+        return running_time()
+
+    try:
+        assert 1000 <= board.run(script) < 1100
+    finally:
+        board.close()